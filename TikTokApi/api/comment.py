@@ -4,6 +4,9 @@ from typing import ClassVar, Iterator, Optional
 from typing import TYPE_CHECKING, ClassVar, Optional
 
 from TikTokApi.exceptions import InvalidResponseException
+from TikTokApi.tracing import traced
+from TikTokApi.metrics import timed_model
+from TikTokApi.session_pool import PRIORITY_BULK
 
 if TYPE_CHECKING:
     from ..tiktok import TikTokApi
@@ -40,6 +43,7 @@ class Comment:
             self.as_dict = data
             self.__extract_from_data()
 
+    @timed_model("comment")
     def __extract_from_data(self):
         data = self.as_dict
         self.id = self.as_dict["cid"]
@@ -51,6 +55,7 @@ class Comment:
         )
         self.likes_count = self.as_dict["digg_count"]
 
+    @traced("Comment.replies")
     async def replies(self, count=20, cursor=0, **kwargs) -> Iterator[Comment]:
         found = 0
 
@@ -67,6 +72,7 @@ class Comment:
                 params=params,
                 headers=kwargs.get("headers"),
                 session_index=kwargs.get("session_index"),
+                priority=kwargs.get("priority", PRIORITY_BULK),
             )
 
             if resp is None:
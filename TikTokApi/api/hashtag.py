@@ -1,5 +1,8 @@
 from __future__ import annotations
 from ..exceptions import *
+from ..tracing import traced
+from ..metrics import timed_model
+from ..session_pool import PRIORITY_BULK, PRIORITY_INTERACTIVE
 
 from typing import TYPE_CHECKING, ClassVar, Iterator, Optional
 
@@ -43,6 +46,10 @@ class Hashtag:
             self.name = name
         if id is not None:
             self.id = id
+        elif name is not None and getattr(Hashtag, "parent", None) is not None:
+            known_id = Hashtag.parent.identifier_cache.hashtag(name)
+            if known_id is not None:
+                self.id = known_id
 
         if data is not None:
             self.as_dict = data
@@ -73,6 +80,7 @@ class Hashtag:
             params=url_params,
             headers=kwargs.get("headers"),
             session_index=kwargs.get("session_index"),
+            priority=kwargs.get("priority", PRIORITY_INTERACTIVE),
         )
 
         if resp is None:
@@ -82,6 +90,7 @@ class Hashtag:
         self.__extract_from_data()
         return resp
 
+    @traced("Hashtag.videos")
     async def videos(self, count=30, cursor=0, **kwargs) -> Iterator[Video]:
         """
         Returns TikTok videos that have this hashtag in the caption.
@@ -104,6 +113,11 @@ class Hashtag:
         """
 
         id = getattr(self, "id", None)
+        name = getattr(self, "name", None)
+        if id is None and name is not None:
+            id = await Hashtag.parent.identifier_cache.load_hashtag(name)
+            if id is not None:
+                self.id = id
         if id is None:
             await self.info(**kwargs)
 
@@ -120,6 +134,7 @@ class Hashtag:
                 params=params,
                 headers=kwargs.get("headers"),
                 session_index=kwargs.get("session_index"),
+                priority=kwargs.get("priority", PRIORITY_BULK),
             )
 
             if resp is None:
@@ -136,6 +151,7 @@ class Hashtag:
 
             cursor = resp.get("cursor")
 
+    @timed_model("hashtag")
     def __extract_from_data(self):
         data = self.as_dict
         keys = data.keys()
@@ -155,6 +171,8 @@ class Hashtag:
 
         id = getattr(self, "id", None)
         name = getattr(self, "name", None)
+        if getattr(Hashtag, "parent", None) is not None:
+            Hashtag.parent.identifier_cache.add_hashtag(name, id)
         if None in (id, name):
             Hashtag.parent.logger.error(
                 f"Failed to create Hashtag with data: {data}\nwhich has keys {data.keys()}"
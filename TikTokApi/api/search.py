@@ -3,6 +3,8 @@ from urllib.parse import urlencode
 from typing import TYPE_CHECKING, Iterator
 from .user import User
 from ..exceptions import InvalidResponseException
+from ..tracing import traced
+from ..session_pool import PRIORITY_BULK
 
 if TYPE_CHECKING:
     from ..tiktok import TikTokApi
@@ -42,6 +44,7 @@ class Search:
             yield user
 
     @staticmethod
+    @traced("Search.search_type")
     async def search_type(
         search_term, obj_type, count=10, cursor=0, **kwargs
     ) -> Iterator:
@@ -83,6 +86,7 @@ class Search:
                 params=params,
                 headers=kwargs.get("headers"),
                 session_index=kwargs.get("session_index"),
+                priority=kwargs.get("priority", PRIORITY_BULK),
             )
 
             if resp is None:
@@ -1,5 +1,8 @@
 from __future__ import annotations
 from ..exceptions import *
+from ..tracing import traced
+from ..metrics import timed_model
+from ..session_pool import PRIORITY_BULK, PRIORITY_INTERACTIVE
 from typing import TYPE_CHECKING, ClassVar, Iterator, Optional
 
 if TYPE_CHECKING:
@@ -52,6 +55,7 @@ class Sound:
 
         Raises:
             InvalidResponseException: If TikTok returns an invalid response, or one we don't understand.
+            SoundRemovedException: If TikTok removed the sound.
 
         Example Usage:
             .. code-block:: python
@@ -70,20 +74,32 @@ class Sound:
             "musicId": id,
         }
 
+        resp = await self.parent._negative_cached(
+            ("sound", id), lambda: self.__fetch_info(url_params, **kwargs)
+        )
+
+        self.as_dict = resp
+        self.__extract_from_data()
+        return resp
+
+    async def __fetch_info(self, url_params: dict, **kwargs) -> dict:
         resp = await self.parent.make_request(
             url="https://www.tiktok.com/api/music/detail/",
             params=url_params,
             headers=kwargs.get("headers"),
             session_index=kwargs.get("session_index"),
+            priority=kwargs.get("priority", PRIORITY_INTERACTIVE),
         )
 
         if resp is None:
             raise InvalidResponseException(resp, "TikTok returned an invalid response.")
 
-        self.as_dict = resp
-        self.__extract_from_data()
+        music = resp.get("musicInfo", {}).get("music")
+        if isinstance(music, dict) and not music.get("id"):
+            raise SoundRemovedException(resp, "TikTok removed this sound.")
         return resp
 
+    @traced("Sound.videos")
     async def videos(self, count=30, cursor=0, **kwargs) -> Iterator[Video]:
         """
         Returns Video objects of videos created with this sound.
@@ -118,11 +134,15 @@ class Sound:
                 "cursor": cursor,
             }
 
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/music/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
+            resp = await self.parent._negative_cached(
+                ("sound", id),
+                lambda: self.parent.make_request(
+                    url="https://www.tiktok.com/api/music/item_list/",
+                    params=params,
+                    headers=kwargs.get("headers"),
+                    session_index=kwargs.get("session_index"),
+                    priority=kwargs.get("priority", PRIORITY_BULK),
+                ),
             )
 
             if resp is None:
@@ -139,6 +159,7 @@ class Sound:
 
             cursor = resp.get("cursor")
 
+    @timed_model("sound")
     def __extract_from_data(self):
         data = self.as_dict
         keys = data.keys()
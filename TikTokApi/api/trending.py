@@ -1,5 +1,7 @@
 from __future__ import annotations
 from ..exceptions import InvalidResponseException
+from ..tracing import traced
+from ..session_pool import PRIORITY_BULK
 from .video import Video
 
 from typing import TYPE_CHECKING, Iterator
@@ -14,6 +16,7 @@ class Trending:
     parent: TikTokApi
 
     @staticmethod
+    @traced("Trending.videos")
     async def videos(count=30, **kwargs) -> Iterator[Video]:
         """
         Returns Videos that are trending on TikTok.
@@ -45,6 +48,8 @@ class Trending:
                 params=params,
                 headers=kwargs.get("headers"),
                 session_index=kwargs.get("session_index"),
+                priority=kwargs.get("priority", PRIORITY_BULK),
+                coalesce=False,  # every call returns different videos
             )
 
             if resp is None:
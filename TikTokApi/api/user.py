@@ -1,6 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, ClassVar, Iterator, Optional
 from ..exceptions import InvalidResponseException
+from ..tracing import traced
+from ..metrics import timed_model
+from ..session_pool import PRIORITY_BULK, PRIORITY_INTERACTIVE
 
 if TYPE_CHECKING:
     from ..tiktok import TikTokApi
@@ -53,6 +56,8 @@ class User:
 
         Raises:
             InvalidResponseException: If TikTok returns an invalid response, or one we don't understand.
+            NotFoundException: If the user doesn't exist or was banned.
+            PrivateAccountException: If the user's account is private.
 
         Example Usage:
             .. code-block:: python
@@ -73,11 +78,15 @@ class User:
             "msToken": kwargs.get("ms_token"),
         }
 
-        resp = await self.parent.make_request(
-            url="https://www.tiktok.com/api/user/detail/",
-            params=url_params,
-            headers=kwargs.get("headers"),
-            session_index=kwargs.get("session_index"),
+        resp = await self.parent._negative_cached(
+            ("user", username),
+            lambda: self.parent.make_request(
+                url="https://www.tiktok.com/api/user/detail/",
+                params=url_params,
+                headers=kwargs.get("headers"),
+                session_index=kwargs.get("session_index"),
+                priority=kwargs.get("priority", PRIORITY_INTERACTIVE),
+            ),
         )
 
         if resp is None:
@@ -87,6 +96,7 @@ class User:
         self.__extract_from_data()
         return resp
 
+    @traced("User.videos")
     async def videos(self, count=30, cursor=0, **kwargs) -> Iterator[Video]:
         """
         Returns a user's videos.
@@ -107,9 +117,7 @@ class User:
                 async for video in api.user(username="davidteathercodes").videos():
                     # do something
         """
-        sec_uid = getattr(self, "sec_uid", None)
-        if sec_uid is None or sec_uid == "":
-            await self.info(**kwargs)
+        await self.__load_sec_uid(**kwargs)
 
         found = 0
         while found < count:
@@ -119,11 +127,15 @@ class User:
                 "cursor": cursor,
             }
 
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/post/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
+            resp = await self.parent._negative_cached(
+                ("user", self.sec_uid),
+                lambda: self.parent.make_request(
+                    url="https://www.tiktok.com/api/post/item_list/",
+                    params=params,
+                    headers=kwargs.get("headers"),
+                    session_index=kwargs.get("session_index"),
+                    priority=kwargs.get("priority", PRIORITY_BULK),
+                ),
             )
 
             if resp is None:
@@ -140,6 +152,7 @@ class User:
 
             cursor = resp.get("cursor")
 
+    @traced("User.liked")
     async def liked(
         self, count: int = 30, cursor: int = 0, **kwargs
     ) -> Iterator[Video]:
@@ -154,7 +167,8 @@ class User:
             async iterator/generator: Yields TikTokApi.video objects.
 
         Raises:
-            InvalidResponseException: If TikTok returns an invalid response, the user's likes are private, or one we don't understand.
+            InvalidResponseException: If TikTok returns an invalid response, or one we don't understand.
+            PrivateAccountException: If the user's likes are private.
 
         Example Usage:
             .. code-block:: python
@@ -162,9 +176,7 @@ class User:
                 async for like in api.user(username="davidteathercodes").liked():
                     # do something
         """
-        sec_uid = getattr(self, "sec_uid", None)
-        if sec_uid is None or sec_uid == "":
-            await self.info(**kwargs)
+        await self.__load_sec_uid(**kwargs)
 
         found = 0
         while found < count:
@@ -174,11 +186,15 @@ class User:
                 "cursor": cursor,
             }
 
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/favorite/item_list",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
+            resp = await self.parent._negative_cached(
+                ("liked", self.sec_uid),
+                lambda: self.parent.make_request(
+                    url="https://www.tiktok.com/api/favorite/item_list",
+                    params=params,
+                    headers=kwargs.get("headers"),
+                    session_index=kwargs.get("session_index"),
+                    priority=kwargs.get("priority", PRIORITY_BULK),
+                ),
             )
 
             if resp is None:
@@ -195,6 +211,7 @@ class User:
 
             cursor = resp.get("cursor")
 
+    @timed_model("user")
     def __extract_from_data(self):
         data = self.as_dict
         keys = data.keys()
@@ -217,7 +234,32 @@ class User:
                 f"Failed to create User with data: {data}\nwhich has keys {data.keys()}"
             )
 
+    async def __load_sec_uid(self, **kwargs):
+        """Fill in the sec_uid from the identifier cache, or from info() if it's unknown"""
+        if getattr(self, "sec_uid", None):
+            return
+        username = getattr(self, "username", None)
+        if username:
+            known = await User.parent.identifier_cache.load_user(username)
+            if known is not None:
+                self.user_id = getattr(self, "user_id", None) or known[0]
+                self.sec_uid = known[1]
+                return
+        await self.info(**kwargs)
+
     def __update_id_sec_uid_username(self, id, sec_uid, username):
+        # Users can be created before any TikTokApi sets User.parent
+        parent = getattr(User, "parent", None)
+        if parent is not None:
+            identifiers = parent.identifier_cache
+            if username and not sec_uid:
+                known = identifiers.user(username)
+                if known is not None:
+                    id = id or known[0]
+                    sec_uid = known[1]
+            else:
+                identifiers.add_user(username, id, sec_uid)
+
         self.user_id = id
         self.sec_uid = sec_uid
         self.username = username
@@ -1,9 +1,12 @@
 from __future__ import annotations
-from ..helpers import extract_video_id_from_url
+from ..helpers import extract_video_id_from_url, status_code_exception
 from typing import TYPE_CHECKING, ClassVar, Iterator, Optional
 from datetime import datetime
 import requests
 from ..exceptions import InvalidResponseException
+from ..tracing import traced
+from ..metrics import timed_model
+from ..session_pool import PRIORITY_BULK
 import json
 #new imports
 from stem import Signal
@@ -255,6 +258,9 @@ class Video:
         if data is not None:
             self.as_dict = data
             self.__extract_from_data()
+        elif url is not None and self.parent.cassette is not None and self.parent.cassette.replaying:
+            # Can't resolve short urls offline, only canonical ones are replayable
+            self.id = url.split("/video/")[1].split("?")[0] if "/video/" in url else None
         elif url is not None:
             i, session = self.parent._get_session(**kwargs)
             self.id = extract_video_id_from_url(
@@ -279,6 +285,8 @@ class Video:
 
         Raises:
             InvalidResponseException: If TikTok returns an invalid response, or one we don't understand.
+            NotFoundException: If the video was deleted or doesn't exist.
+            PrivateAccountException: If the video is private.
 
         Example Usage:
             .. code-block:: python
@@ -286,40 +294,63 @@ class Video:
                 url = "https://www.tiktok.com/@davidteathercodes/video/7106686413101468970"
                 video_info = await api.video(url=url).info()
         """
-        i, session = self.parent._get_session(**kwargs)
-        proxy = (
-            kwargs.get("proxy") if kwargs.get("proxy") is not None else session.proxy
-        )
         if self.url is None:
             raise TypeError("To call video.info() you need to set the video's url.")
 
-        r = requests.get(self.url, headers=session.headers, proxies=proxy)
-        
-        if 'captcha-us' in r.text:
+        video_info, text = await self.parent._negative_cached(
+            ("video", self.id),
+            lambda: self.parent._cached(
+                self.url, "/video/", lambda: self.__fetch_info(**kwargs)
+            ),
+        )
+        self.as_dict = video_info
+        self.__extract_from_data()
+        return video_info, text
+
+    async def __fetch_info(self, **kwargs) -> tuple[dict, str]:
+        """Fetch the video's page, returning the video's data and the page"""
+        cassette = self.parent.cassette
+        if cassette is not None and cassette.replaying:
+            text, status_code = await cassette.replay(self.url)
+        else:
+            i, session = self.parent._get_session(**kwargs)
+            proxy = (
+                kwargs.get("proxy") if kwargs.get("proxy") is not None else session.proxy
+            )
+
+            started_at = time.monotonic()
+            r = requests.get(self.url, headers=session.headers, proxies=proxy)
+            text, status_code = r.text, r.status_code
+            if cassette is not None:
+                cassette.record(
+                    self.url, text, time.monotonic() - started_at, status=status_code
+                )
+
+        if 'captcha-us' in text:
             print('CAPTCAHA,CAPTCHA,captcha')
-            print(r.text)
+            print(text)
             with open('fil.txt','a') as writer:
-                writer.write(r.text)
-        if r.status_code != 200:
+                writer.write(text)
+        if status_code != 200:
             raise InvalidResponseException(
-                r.text, "TikTok returned an invalid response.", error_code=r.status_code
+                text, "TikTok returned an invalid response.", error_code=status_code
             )
 
         # Try SIGI_STATE first
         # extract tag <script id="SIGI_STATE" type="application/json">{..}</script>
         # extract json in the middle
 
-        start = r.text.find('<script id="SIGI_STATE" type="application/json">')
+        start = text.find('<script id="SIGI_STATE" type="application/json">')
         if start != -1:
             start += len('<script id="SIGI_STATE" type="application/json">')
-            end = r.text.find("</script>", start)
+            end = text.find("</script>", start)
 
             if end == -1:
                 raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response.", error_code=r.status_code
+                    text, "TikTok returned an invalid response.", error_code=status_code
                 )
 
-            data = json.loads(r.text[start:end])
+            data = await self.parent.json_codec.decode(text[start:end])
             video_info = data["ItemModule"][self.id]
         else:
             # Try __UNIVERSAL_DATA_FOR_REHYDRATION__ next
@@ -327,36 +358,35 @@ class Video:
             # extract tag <script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">{..}</script>
             # extract json in the middle
 
-            start = r.text.find('<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">')
+            start = text.find('<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">')
             if start == -1:
                 raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response.", error_code=r.status_code
+                    text, "TikTok returned an invalid response.", error_code=status_code
                 )
 
             start += len('<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">')
-            end = r.text.find("</script>", start)
+            end = text.find("</script>", start)
 
             if end == -1:
                 raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response.", error_code=r.status_code
+                    text, "TikTok returned an invalid response.", error_code=status_code
                 )
 
-            data = json.loads(r.text[start:end])
+            data = await self.parent.json_codec.decode(text[start:end])
             default_scope = data.get("__DEFAULT_SCOPE__", {})
             video_detail = default_scope.get("webapp.video-detail", {})
-            if video_detail.get("statusCode", 0) != 0: # assume 0 if not present
-                raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response structure.", error_code=r.status_code
+            detail_status_code = video_detail.get("statusCode", 0) # assume 0 if not present
+            if detail_status_code != 0:
+                raise status_code_exception(detail_status_code)(
+                    text, "TikTok returned an invalid response structure.", error_code=detail_status_code
                 )
             video_info = video_detail.get("itemInfo", {}).get("itemStruct")
             if video_info is None:
                 raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response structure.", error_code=r.status_code
+                    text, "TikTok returned an invalid response structure.", error_code=status_code
                 )
-            
-        self.as_dict = video_info
-        self.__extract_from_data()
-        return video_info, r.text
+
+        return video_info, text
 
     async def bytes(self, **kwargs) -> bytes:
         """
@@ -407,6 +437,7 @@ class Video:
         ]
         return bytes(byte_values)
 
+    @timed_model("video")
     def __extract_from_data(self) -> None:
         data = self.as_dict
         self.id = data["id"]
@@ -443,6 +474,7 @@ class Video:
             controller.signal(Signal.NEWNYM)
             controller.close()
     
+    @traced("Video.comments")
     async def comments(self, count=20, cursor=0, **kwargs) -> Iterator[Comment]:
         """
         Returns the comments of a TikTok Video.
@@ -477,6 +509,7 @@ class Video:
                 params=params,
                 headers=kwargs.get("headers"),
                 session_index=kwargs.get("session_index"),
+                priority=kwargs.get("priority", PRIORITY_BULK),
             )
 
             if resp is None:
@@ -502,6 +535,7 @@ class Video:
             else:
                raise e    
       
+    @traced("Video.related_videos")
     async def related_videos(
         self, count: int = 30, cursor: int = 0, **kwargs
     ) -> Iterator[Video]:
@@ -534,6 +568,7 @@ class Video:
                 params=params,
                 headers=kwargs.get("headers"),
                 session_index=kwargs.get("session_index"),
+                priority=kwargs.get("priority", PRIORITY_BULK),
             )
 
             if resp is None:
@@ -0,0 +1,436 @@
+import asyncio
+import collections
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Hashable, Optional
+
+from .exceptions import (
+    NotFoundException,
+    PrivateAccountException,
+    SoundRemovedException,
+    TikTokException,
+)
+
+# Seconds to keep the responses of info() endpoints for
+DEFAULT_TTLS = {
+    "/api/user/detail/": 300,
+    "/api/music/detail/": 600,
+    "/api/challenge/detail/": 600,
+    "/video/": 300,  # Video.info
+}
+
+# Endpoints the disk cache shouldn't keep, every call should get new results
+DEFAULT_DISK_TTLS = {
+    "/api/recommend/item_list/": 0,
+}
+
+# Seconds to remember that an object is gone or private for
+DEFAULT_NEGATIVE_TTLS = {
+    NotFoundException: 24 * 3600,
+    PrivateAccountException: 3600,
+    SoundRemovedException: 7 * 24 * 3600,
+}
+
+
+def approximate_size(value: Any) -> int:
+    """Roughly how many bytes a decoded JSON value took to send"""
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return 2 + sum(
+            approximate_size(k) + approximate_size(v) + 2 for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(approximate_size(v) + 1 for v in value)
+    return 8
+
+
+class ResponseCache:
+    """
+    An in-memory cache of TikTok's responses with per endpoint TTLs and LRU eviction.
+
+    Once a response's TTL passes it's served stale for stale_ttl more seconds
+    while a fresh copy is fetched in the background. Cached responses are
+    shared between callers, so don't modify them.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.cache import ResponseCache
+
+            api = TikTokApi(response_cache=ResponseCache(max_entries=50_000))
+            user_data = await api.user(username="therock").info()
+            print(api.response_cache.stats())
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[dict] = None,
+        default_ttl: Optional[float] = None,
+        stale_ttl: float = 60.0,
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            ttls (dict): Seconds to cache each endpoint for, keyed by url path, defaults to DEFAULT_TTLS.
+            default_ttl (float): Seconds to cache endpoints missing from ttls for, they aren't cached if None.
+            stale_ttl (float): Seconds past its TTL that a response is still served while it's refreshed.
+            max_entries (int): The most responses to keep, unlimited if None.
+            max_bytes (int): The most approximate bytes of responses to keep, unlimited if None.
+        """
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = collections.OrderedDict()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """The seconds to cache an endpoint's responses for, None if they aren't cached"""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: str) -> Optional[tuple[Any, bool]]:
+        """
+        Look up a response.
+
+        Returns:
+            tuple[Any, bool]: The response and whether it's stale, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now >= entry[2] + self.stale_ttl:
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        value, _, expires_at = entry
+        stale = now >= expires_at
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return value, stale
+
+    def set(self, key: str, value: Any, ttl: float, size: Optional[int] = None):
+        """
+        Store a response.
+
+        Args:
+            key (str): The normalized request key.
+            value (Any): The response.
+            ttl (float): Seconds until the response is stale.
+            size (int): The response's size in bytes, approximated if None.
+        """
+        if size is None:
+            size = approximate_size(value)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, time.monotonic() + ttl)
+        self.bytes += size
+
+        while len(self._entries) > 0 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        """Remove every response"""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's counters.
+
+        Returns:
+            dict: The hits, stale_hits, misses, evictions, entries and bytes of the cache.
+        """
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+        }
+
+
+class SQLiteResponseCache:
+    """
+    A response cache stored in a SQLite database, surviving restarts.
+
+    The database is opened in WAL mode so several worker processes on one host
+    can share it. Bodies are stored as TikTok sent them, compressed with zlib
+    when compress is set. Once the database holds more than max_bytes of
+    bodies the least recently used ones are dropped.
+
+    Every endpoint going through make_request is cached for default_ttl unless
+    ttls says otherwise, an endpoint with a TTL of 0 isn't cached.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.cache import SQLiteResponseCache
+
+            api = TikTokApi(disk_cache=SQLiteResponseCache("tiktok_cache.db"))
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[dict] = None,
+        default_ttl: Optional[float] = 3600,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        compress: bool = True,
+        compact_every: int = 1000,
+    ):
+        """
+        Args:
+            path (str): The SQLite database file.
+            ttls (dict): Seconds to cache each endpoint for, keyed by url path, defaults to DEFAULT_DISK_TTLS.
+            default_ttl (float): Seconds to cache endpoints missing from ttls for, they aren't cached if None.
+            max_bytes (int): The most bytes of stored bodies to keep, unlimited if None.
+            compress (bool): Whether to compress stored bodies.
+            compact_every (int): Compact the database after this many writes.
+        """
+        self.path = path
+        self.ttls = ttls if ttls is not None else DEFAULT_DISK_TTLS
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.compact_every = compact_every
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, compressed INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._db.commit()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """The seconds to cache an endpoint's responses for, None or 0 if they aren't cached"""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, compressed, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[2] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+
+        body, compressed, _ = row
+        if compressed:
+            body = zlib.decompress(body)
+        return body.decode("utf-8")
+
+    def _set(self, key: str, body: str, ttl: float):
+        data = body.encode("utf-8")
+        compressed = self.compress and len(data) >= 512
+        if compressed:
+            data = zlib.compress(data)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, data, int(compressed), len(data), now + ttl, now),
+            )
+            self._db.commit()
+            self._writes += 1
+            if self._writes % self.compact_every == 0:
+                self._compact()
+
+    def _compact(self):
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        if self.max_bytes is not None:
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                # Drop the least recently used bodies until we're under max_bytes
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM ("
+                    "SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS kept "
+                    "FROM responses) WHERE kept > ?)",
+                    (self.max_bytes,),
+                )
+        self._db.commit()
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response body.
+
+        Returns:
+            str: The body, or None if it's missing or expired.
+        """
+        body = await asyncio.to_thread(self._get, key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def set(self, key: str, body: str, ttl: float):
+        """Store a response body for ttl seconds"""
+        await asyncio.to_thread(self._set, key, body, ttl)
+
+    async def compact(self):
+        """Delete expired bodies and shrink the database to max_bytes"""
+
+        def compact():
+            with self._lock:
+                self._compact()
+
+        await asyncio.to_thread(compact)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's counters.
+
+        Returns:
+            dict: The hits, misses, entries and bytes of the cache.
+        """
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+
+class NegativeCache:
+    """
+    Remembers objects TikTok said are missing, removed or private.
+
+    Requests for an object known to be gone raise the same typed exception
+    again without signing or fetching anything. Objects are keyed by their
+    kind and ID, ie. ("user", "therock"), and each kind of exception is
+    remembered for its own TTL.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.cache import NegativeCache
+
+            api = TikTokApi(negative_cache=NegativeCache())
+            try:
+                await api.sound(id="7016547803243022337").info()
+            except SoundRemovedException:
+                # Raised again straight away for the next week
+                pass
+    """
+
+    def __init__(
+        self, ttls: Optional[dict] = None, max_entries: Optional[int] = 100_000
+    ):
+        """
+        Args:
+            ttls (dict): Seconds to remember each exception class for, defaults to DEFAULT_NEGATIVE_TTLS. Exceptions of other classes aren't remembered.
+            max_entries (int): The most objects to remember, unlimited if None.
+        """
+        self.ttls = ttls if ttls is not None else DEFAULT_NEGATIVE_TTLS
+        self.max_entries = max_entries
+        self.hits = 0
+        self._entries = collections.OrderedDict()
+
+    def ttl_for(self, e: Exception) -> Optional[float]:
+        """The seconds to remember an exception for, None if it isn't remembered"""
+        for cls in type(e).__mro__:
+            if cls in self.ttls:
+                return self.ttls[cls]
+        return None
+
+    def check(self, key: Hashable):
+        """
+        Raise the exception remembered for an object, if there is one.
+
+        Raises:
+            TikTokException: The exception TikTok last gave for the object.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        cls, message, error_code, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        raise cls(None, message, error_code=error_code)
+
+    def record(self, key: Hashable, e: Exception):
+        """Remember the exception an object raised if it's one that's remembered"""
+        ttl = self.ttl_for(e)
+        if not ttl or not isinstance(e, TikTokException):
+            return
+        self._entries[key] = (type(e), e.message, e.error_code, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, key: Hashable):
+        """Forget anything remembered about an object"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Forget every object"""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's counters.
+
+        Returns:
+            dict: The hits and entries of the cache.
+        """
+        return {"hits": self.hits, "entries": len(self._entries)}
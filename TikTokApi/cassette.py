@@ -0,0 +1,144 @@
+import asyncio
+import collections
+import json
+from typing import Optional
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class Cassette:
+    """
+    Records TikTok's responses to a file, or replays them without a browser.
+
+    In record mode every response fetched by make_request, make_requests and
+    Video.info is appended to the cassette along with how long it took,
+    including the final responses of failed requests so they raise the same
+    exception on replay. In
+    replay mode those responses are served instead, so no sessions need to be
+    created and nothing is sent to TikTok. Requests are matched by their url
+    and params ignoring msToken, X-Bogus and other volatile params, and a
+    request made more often than it was recorded gets its last response again.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.cassette import Cassette
+
+            # Record once with real sessions
+            async with TikTokApi(cassette=Cassette("crawl.jsonl", mode="record")) as api:
+                await api.create_sessions(ms_tokens=[ms_token], num_sessions=1)
+                async for video in api.user(username="therock").videos(count=100):
+                    pass
+
+            # Then replay offline, as fast as possible
+            async with TikTokApi(cassette=Cassette("crawl.jsonl")) as api:
+                async for video in api.user(username="therock").videos(count=100):
+                    pass
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, speed: Optional[float] = None):
+        """
+        Args:
+            path (str): The cassette file, one JSON object per line.
+            mode (str): Either "record", which overwrites the file, or "replay".
+            speed (float): How fast to replay relative to the recording, 1.0 waits as long as each response originally took. Responses are served straight away if None.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"mode must be {RECORD!r} or {REPLAY!r}, not {mode!r}")
+
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.recorded = 0
+        self.replayed = 0
+        self._file = None
+        self._responses = {}
+
+        if mode == RECORD:
+            self._file = open(path, "w", encoding="utf-8")
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses.setdefault(
+                            entry["key"], collections.deque()
+                        ).append(entry)
+
+    @property
+    def replaying(self) -> bool:
+        """Whether responses are served from the cassette"""
+        return self.mode == REPLAY
+
+    def record(
+        self,
+        key: str,
+        body: Optional[str],
+        elapsed: float,
+        status: int = 200,
+        error: Optional[str] = None,
+    ):
+        """
+        Append a response to the cassette.
+
+        Args:
+            key (str): The request's key from TikTokApi.helpers.request_key.
+            body (str): The body TikTok sent, None if the fetch failed.
+            elapsed (float): The seconds the request took.
+            status (int): The HTTP status of the response.
+            error (str): Why the fetch failed, if it did.
+        """
+        if self._file is None:
+            return
+        entry = {"key": key, "body": body, "elapsed": elapsed, "status": status}
+        if error is not None:
+            entry["error"] = error
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self.recorded += 1
+
+    async def _next(self, key: str) -> dict:
+        responses = self._responses.get(key)
+        if not responses:
+            raise KeyError(f"No recorded response for {key}")
+
+        entry = responses[0]
+        if len(responses) > 1:
+            responses.popleft()
+        if self.speed is not None:
+            await asyncio.sleep(entry["elapsed"] / self.speed)
+        self.replayed += 1
+        return entry
+
+    async def replay(self, key: str) -> tuple[str, int]:
+        """
+        Serve the next recorded response for a request.
+
+        Returns:
+            tuple[str, int]: The body and HTTP status of the response.
+
+        Raises:
+            KeyError: If the request wasn't recorded.
+        """
+        entry = await self._next(key)
+        return entry["body"], entry.get("status", 200)
+
+    async def replay_fetch(self, key: str) -> list:
+        """
+        Serve the next recorded response for a request of a batch.
+
+        Returns:
+            list: The body and the error of the fetch, like make_requests' fetch scripts.
+
+        Raises:
+            KeyError: If the request wasn't recorded.
+        """
+        entry = await self._next(key)
+        return [entry["body"], entry.get("error")]
+
+    def close(self):
+        """Close the cassette file if recording"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,207 @@
+import collections
+import time
+from typing import Optional
+
+from .exceptions import CircuitOpenException
+from .retry import (
+    CONNECTION,
+    EMPTY_RESPONSE,
+    INVALID_JSON,
+    PAGE_CRASH,
+    STATUS_CODE,
+    TIMEOUT,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Tracks the recent outcomes of one endpoint, failing fast while too many of them failed.
+
+    The breaker starts closed and opens once at least min_requests of the
+    last window requests were counted and failure_rate of them failed. After
+    open_for seconds it's half-open and lets one probe request through, which
+    closes it if it succeeds and opens it again if it fails.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        open_for: float = 30.0,
+    ):
+        """
+        Args:
+            failure_rate (float): The fraction of recent requests that have to fail to open the breaker.
+            window (int): How many of the latest requests the failure rate is over.
+            min_requests (int): The fewest requests in the window before the breaker can open.
+            open_for (float): The seconds the breaker stays open before letting a probe through, and the longest a probe can take before another is let through.
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.open_for = open_for
+        self.state = CLOSED
+        self.opened = 0
+        self._outcomes = collections.deque(maxlen=window)
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def allow(self) -> bool:
+        """Whether a request can be sent now, a half-open breaker only allows one probe at a time"""
+        if self.state == CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self._opened_at < self.open_for:
+                return False
+            self.state = HALF_OPEN
+        elif now - self._probe_started_at < self.open_for:
+            return False
+        # An abandoned probe never records its outcome, so a slow probe is replaced
+        self._probe_started_at = now
+        return True
+
+    def retry_after(self) -> float:
+        """The seconds until the breaker lets a probe through"""
+        if self.state == CLOSED:
+            return 0.0
+        started_at = self._opened_at if self.state == OPEN else self._probe_started_at
+        return max(0.0, started_at + self.open_for - time.monotonic())
+
+    def record(self, failed: bool):
+        """Count the outcome of a request the breaker allowed"""
+        if self.state == HALF_OPEN:
+            if failed:
+                self._open()
+            else:
+                self.state = CLOSED
+                self._outcomes.clear()
+            return
+        if self.state == OPEN:
+            return
+
+        outcomes = self._outcomes
+        outcomes.append(failed)
+        failures = sum(outcomes)
+        if len(outcomes) >= self.min_requests and failures >= (
+            self.failure_rate * len(outcomes)
+        ):
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = time.monotonic()
+        self._probe_started_at = None
+
+    def as_dict(self) -> dict:
+        outcomes = self._outcomes
+        return {
+            "state": self.state,
+            "failure_rate": sum(outcomes) / len(outcomes) if outcomes else 0.0,
+            "requests": len(outcomes),
+            "opened": self.opened,
+            "retry_after": self.retry_after(),
+        }
+
+
+class CircuitBreakers:
+    """
+    A circuit breaker for each endpoint make_request sends to.
+
+    While an endpoint's breaker is open its requests raise
+    CircuitOpenException instead of taking up sessions, so paginators of a
+    failing endpoint stop quickly and the other endpoints keep their
+    throughput. Responses served from a cache or cassette skip the breakers.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.circuit_breaker import CircuitBreakers
+            from TikTokApi.exceptions import CircuitOpenException
+
+            api = TikTokApi(circuit_breakers=CircuitBreakers(failure_rate=0.5, open_for=60))
+            ...
+            try:
+                async for video in api.user(username="therock").liked():
+                    ...
+            except CircuitOpenException:
+                print(api.circuit_breakers.stats())
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        open_for: float = 30.0,
+        failure_kinds: tuple = (
+            EMPTY_RESPONSE,
+            INVALID_JSON,
+            STATUS_CODE,
+            TIMEOUT,
+            PAGE_CRASH,
+            CONNECTION,
+        ),
+    ):
+        """
+        Args:
+            failure_rate (float): The fraction of an endpoint's recent requests that have to fail to open its breaker.
+            window (int): How many of an endpoint's latest requests the failure rate is over.
+            min_requests (int): The fewest requests in the window before a breaker can open.
+            open_for (float): The seconds a breaker stays open before letting a probe through.
+            failure_kinds (tuple): The kinds of failures, from TikTokApi.retry, that count against an endpoint.
+        """
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_requests = min_requests
+        self.open_for = open_for
+        self.failure_kinds = failure_kinds
+        self._breakers = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """The breaker of endpoint, created closed the first time it's asked for"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                self.failure_rate, self.window, self.min_requests, self.open_for
+            )
+        return breaker
+
+    def check(self, endpoint: str):
+        """
+        Make sure a request can be sent to endpoint.
+
+        Raises:
+            CircuitOpenException: If the endpoint's breaker is open, or half-open with a probe in flight.
+        """
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenException(
+                None,
+                f"Circuit for {endpoint} is {breaker.state}, "
+                f"next probe in {breaker.retry_after():.1f}s",
+            )
+
+    def record(self, endpoint: str, kind: Optional[str]):
+        """
+        Count the outcome of a request to endpoint.
+
+        Args:
+            endpoint (str): The url path the request was sent to.
+            kind (str): The kind of failure from TikTokApi.retry.classify_failure, None if the request didn't fail.
+        """
+        self.breaker(endpoint).record(kind in self.failure_kinds)
+
+    def stats(self) -> dict:
+        """
+        Returns the state of every endpoint's breaker.
+
+        Returns:
+            dict: Maps each endpoint to its breaker's state, failure_rate, requests in the window, how many times it opened and the seconds until its next probe.
+        """
+        return {k: b.as_dict() for k, b in self._breakers.items()}
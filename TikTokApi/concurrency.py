@@ -0,0 +1,197 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from typing import Optional
+
+from .metrics import Metrics
+from .retry import classify_failure
+from .session_pool import PRIORITY_DEFAULT
+
+
+class ConcurrencyController:
+    """
+    Finds how many requests a TikTokApi can have in flight by additive increase, multiplicative decrease.
+
+    Every attempt make_request sends to TikTok holds a slot in a window of
+    limit slots, waiting for one when they're all taken. Waiters get slots in
+    order of priority, aged like the SessionPool's. After each round of
+    limit attempts, the round's mean latency and error rate are checked
+    against the targets. If either is over, the limit is multiplied by
+    decrease. Otherwise, if the round filled the window, the limit grows by
+    increase. Over time the limit settles just under the point where adding
+    requests only adds latency.
+
+    When the TikTokApi has metrics, the limit and the signals behind it are
+    set as gauges prefixed with concurrency\\_.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.concurrency import ConcurrencyController
+
+            api = TikTokApi(concurrency=ConcurrencyController(latency_target=1.5))
+            ...
+            print(api.concurrency.stats())
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 256,
+        increase: float = 1,
+        decrease: float = 0.5,
+        latency_target: float = 2.0,
+        error_rate_target: float = 0.05,
+        aging: float = 0.1,
+    ):
+        """
+        Args:
+            initial_limit (float): The limit to start at.
+            min_limit (float): The limit never drops below this.
+            max_limit (float): The limit never grows past this.
+            increase (float): Added to the limit after a healthy round that filled the window.
+            decrease (float): The limit is multiplied by this after a round over either target.
+            latency_target (float): The most seconds an attempt should take on average, from sending it on a session to decoding the response.
+            error_rate_target (float): The largest fraction of attempts in a round that can fail.
+            aging (float): How much a waiter's priority rises per second, see SessionPool.
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.error_rate_target = error_rate_target
+        self.aging = aging
+        self.in_flight = 0
+        self.latency = None
+        self.error_rate = None
+        self.increases = 0
+        self.decreases = 0
+        self.metrics: Optional[Metrics] = None
+        """Where the limit and signals are set as gauges, set by TikTokApi."""
+        self._waiters = []
+        self._order = itertools.count()
+        self._round_latency = 0.0
+        self._round_errors = 0
+        self._round_samples = 0
+        self._round_saturated = False
+
+    def _has_room(self) -> bool:
+        return self.in_flight < max(1, int(self.limit))
+
+    async def acquire(self, priority: float = PRIORITY_DEFAULT):
+        """Wait for a slot in the window, lower priorities first, call release when the attempt is done"""
+        if not self._waiters and self._has_room():
+            self._take()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority + time.monotonic() * self.aging, next(self._order), future)
+        heapq.heappush(self._waiters, waiter)
+        self._round_saturated = True
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over as the waiter was cancelled
+                self.in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: float = PRIORITY_DEFAULT):
+        """
+        Hold a slot for the block, failures of a kind TikTokApi.retry knows count as errors.
+
+        Yields:
+            Callable: Starts the attempt's latency clock, call it once the request is sent so time spent waiting for a session or the rate limiter isn't counted. The clock starts on entering the block if it's never called.
+        """
+        await self.acquire(priority)
+        started_at = time.perf_counter()
+
+        def start():
+            nonlocal started_at
+            started_at = time.perf_counter()
+
+        failed = False
+        try:
+            yield start
+        except Exception as e:
+            failed = classify_failure(e) is not None
+            raise
+        finally:
+            self.release(time.perf_counter() - started_at, failed)
+
+    def _take(self):
+        self.in_flight += 1
+        if not self._has_room():
+            self._round_saturated = True
+
+    def _wake(self):
+        while self._waiters and self._has_room():
+            future = heapq.heappop(self._waiters)[-1]
+            if not future.done():
+                self._take()
+                future.set_result(None)
+
+    def release(self, latency: float, failed: bool = False):
+        """
+        Give back a slot, counting the attempt towards the current round.
+
+        Args:
+            latency (float): The seconds the attempt took.
+            failed (bool): Whether the attempt failed in a way that suggests TikTok or the sessions are overloaded.
+        """
+        self.in_flight -= 1
+        self._round_samples += 1
+        self._round_errors += failed
+        self._round_latency += latency
+        if self._round_samples >= max(1, int(self.limit)):
+            self._adjust()
+        self._wake()
+        if self.metrics is not None:
+            for name, value in self.stats().items():
+                if value is not None:
+                    self.metrics.gauge(f"concurrency_{name}", value)
+
+    def _adjust(self):
+        samples = self._round_samples
+        self.latency = self._round_latency / samples
+        self.error_rate = self._round_errors / samples
+        if (
+            self.latency > self.latency_target
+            or self.error_rate > self.error_rate_target
+        ):
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+            self.decreases += 1
+        elif self._round_saturated:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            self.increases += 1
+        self._round_latency = 0.0
+        self._round_errors = 0
+        self._round_samples = 0
+        self._round_saturated = self.in_flight >= max(1, int(self.limit))
+
+    def stats(self) -> dict:
+        """
+        Returns the window and the signals behind it.
+
+        Returns:
+            dict: The limit, in_flight and waiting counts, the mean latency and error_rate of the last round, and how many times the limit was increased and decreased.
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
@@ -33,3 +33,15 @@ class InvalidJSONException(TikTokException):
 
 class InvalidResponseException(TikTokException):
     """The response from TikTok was invalid."""
+
+
+class StatusCodeException(InvalidResponseException):
+    """TikTok responded with a non-zero status_code."""
+
+
+class PrivateAccountException(TikTokException):
+    """This TikTok object is private."""
+
+
+class CircuitOpenException(TikTokException):
+    """Requests to this endpoint are failing fast after too many recent failures."""
@@ -0,0 +1,96 @@
+import collections
+import math
+from typing import Iterable, Optional
+
+from .retry import RetryBudget
+
+
+class Hedging:
+    """
+    Sends a duplicate of a slow request on another session, using whichever response comes back first.
+
+    Every read TikTokApi makes is idempotent, so once an attempt has held a
+    session for longer than the percentile of its endpoint's recent
+    latencies, a hedge of it goes out on a different session. The first
+    response wins and the other attempt is cancelled. Hedges are paid for
+    from a budget that earns ratio of a hedge per request, which caps the
+    extra load. A hedge is only sent if another session has a free slot, and
+    requests pinned to a session_index are never hedged.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.hedging import Hedging
+
+            api = TikTokApi(hedging=Hedging(percentile=0.9))
+            ...
+            print(api.hedging.stats())
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.0,
+        budget: Optional[RetryBudget] = None,
+        endpoints: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            percentile (float): The percentile of an endpoint's recent latency an attempt has to exceed to be hedged.
+            window (int): How many of an endpoint's latest latencies the percentile is over.
+            min_samples (int): The fewest latencies an endpoint needs before its requests are hedged.
+            min_delay (float): The fewest seconds to wait before hedging.
+            budget (RetryBudget): Caps how many hedges are sent, defaults to 5% of requests with up to 10 saved up.
+            endpoints (Iterable[str]): The url paths to hedge, every endpoint if None.
+        """
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = (
+            budget
+            if budget is not None
+            else RetryBudget(ratio=0.05, min_per_second=0.0, max_balance=10.0)
+        )
+        self.endpoints = frozenset(endpoints) if endpoints is not None else None
+        self.hedges = 0
+        self.wins = 0
+        self._latencies = {}
+
+    def covers(self, endpoint: str) -> bool:
+        """Whether requests to endpoint can be hedged"""
+        return self.endpoints is None or endpoint in self.endpoints
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """The seconds after which an attempt on endpoint is hedged, None if too few latencies were recorded"""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        rank = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return max(self.min_delay, ordered[max(0, rank)])
+
+    def record(self, endpoint: str, latency: float):
+        """Remember how many seconds a successful attempt on endpoint took"""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None:
+            latencies = self._latencies[endpoint] = collections.deque(
+                maxlen=self.window
+            )
+        latencies.append(latency)
+
+    def stats(self) -> dict:
+        """
+        Returns how hedging is going.
+
+        Returns:
+            dict: How many hedges were sent, how many of them won, how many were refused by the budget, and the current hedge delay of each endpoint.
+        """
+        return {
+            "hedges": self.hedges,
+            "wins": self.wins,
+            "refused": self.budget.exhausted,
+            "delays": {endpoint: self.delay(endpoint) for endpoint in self._latencies},
+        }
@@ -2,6 +2,20 @@ from .exceptions import *
 
 import requests
 import random
+from urllib.parse import urlencode, quote
+
+# Params that change between otherwise identical requests
+VOLATILE_PARAMS = frozenset({"msToken", "X-Bogus", "device_id", "history_len"})
+
+# status_codes TikTok uses for objects that are gone or hidden
+_STATUS_CODE_EXCEPTIONS = {
+    10201: NotFoundException,  # Content not found
+    10202: NotFoundException,  # User doesn't exist
+    10204: NotFoundException,  # Video not available
+    10221: NotFoundException,  # User banned
+    10216: PrivateAccountException,  # Private video
+    10222: PrivateAccountException,  # Private account
+}
 
 
 def extract_video_id_from_url(url, headers={}, proxy=None):
@@ -22,3 +36,18 @@ def random_choice(choices: list):
     if choices is None or len(choices) == 0:
         return None
     return random.choice(choices)
+
+
+def request_key(url: str, params: dict = None, ignore=VOLATILE_PARAMS) -> str:
+    """Identify a request by its url and logical params, leaving out the ignored ones"""
+    if not params:
+        return url
+    items = sorted(
+        (k, str(v)) for k, v in params.items() if k not in ignore and v is not None
+    )
+    return f"{url}?{urlencode(items, quote_via=quote)}"
+
+
+def status_code_exception(status_code: int) -> type:
+    """The exception class for a non-zero status_code from TikTok"""
+    return _STATUS_CODE_EXCEPTIONS.get(status_code, StatusCodeException)
@@ -0,0 +1,226 @@
+import asyncio
+import sqlite3
+import threading
+from typing import Optional
+
+
+class IdentifierCache:
+    """
+    Remembers the IDs of users and hashtags seen in TikTok's responses.
+
+    Paginating a user's videos needs their secUid and a hashtag's videos need
+    its ID, which would otherwise cost an extra info() request whenever only
+    the username or hashtag name is known. Every User and Hashtag built from
+    TikTok's data, including video authors, comment authors and search
+    results, adds its IDs here so later lookups can skip that request.
+
+    The map is kept in memory, and also in a SQLite database if path is set
+    so it survives restarts. Constructors only look in memory, the database
+    is read by load_user() and load_hashtag() and written in the background,
+    both off the event loop.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.identifiers import IdentifierCache
+
+            api = TikTokApi(identifier_cache=IdentifierCache("identifiers.db"))
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = 1_000_000,
+        flush_every: int = 100,
+    ):
+        """
+        Args:
+            path (str): A SQLite database to store the IDs in, they're only kept in memory if None.
+            max_entries (int): The most users and the most hashtags to keep in memory, unlimited if None.
+            flush_every (int): Write new IDs to the database once this many are waiting.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self._users = {}
+        self._hashtags = {}
+        self._pending_users = {}
+        self._pending_hashtags = {}
+        self._flushes = set()
+
+        self._db = None
+        self._lock = threading.Lock()
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "username TEXT PRIMARY KEY, user_id TEXT NOT NULL, sec_uid TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS hashtags (name TEXT PRIMARY KEY, id TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def _remember(self, entries: dict, key: str, value):
+        entries.pop(key, None)
+        entries[key] = value
+        if self.max_entries is not None and len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+
+    def _count(self, value):
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _select(self, query: str, key: str) -> Optional[tuple]:
+        with self._lock:
+            if self._db is None:
+                return None
+            return self._db.execute(query, (key,)).fetchone()
+
+    async def _load(self, entries: dict, key: str, query: str):
+        value = entries.get(key)
+        if value is None and self._db is not None:
+            row = await asyncio.to_thread(self._select, query, key)
+            if row is not None:
+                value = row if len(row) > 1 else row[0]
+                self._remember(entries, key, value)
+        return self._count(value)
+
+    def user(self, username: str) -> Optional[tuple[str, str]]:
+        """
+        Look up a user's IDs in memory, a miss isn't counted since load_user() may still find them.
+
+        Returns:
+            tuple[str, str]: The user's user_id and sec_uid, or None if they're unknown.
+        """
+        value = self._users.get(username.lower())
+        return self._count(value) if value is not None else None
+
+    def hashtag(self, name: str) -> Optional[str]:
+        """
+        Look up a hashtag's ID in memory, a miss isn't counted since load_hashtag() may still find it.
+
+        Returns:
+            str: The hashtag's ID, or None if it's unknown.
+        """
+        value = self._hashtags.get(name.lower())
+        return self._count(value) if value is not None else None
+
+    async def load_user(self, username: str) -> Optional[tuple[str, str]]:
+        """
+        Look up a user's IDs in memory, then in the database.
+
+        Returns:
+            tuple[str, str]: The user's user_id and sec_uid, or None if they're unknown.
+        """
+        return await self._load(
+            self._users,
+            username.lower(),
+            "SELECT user_id, sec_uid FROM users WHERE username = ?",
+        )
+
+    async def load_hashtag(self, name: str) -> Optional[str]:
+        """
+        Look up a hashtag's ID in memory, then in the database.
+
+        Returns:
+            str: The hashtag's ID, or None if it's unknown.
+        """
+        return await self._load(
+            self._hashtags, name.lower(), "SELECT id FROM hashtags WHERE name = ?"
+        )
+
+    def add_user(self, username: str, user_id: str, sec_uid: str):
+        """Remember a user's IDs, ignored unless they're all set"""
+        if not (username and user_id and sec_uid):
+            return
+        key = username.lower()
+        value = (user_id, sec_uid)
+        if self._users.get(key) == value:
+            return
+        self._remember(self._users, key, value)
+        if self._db is not None:
+            self._pending_users[key] = value
+            self._maybe_flush()
+
+    def add_hashtag(self, name: str, id: str):
+        """Remember a hashtag's ID, ignored unless both are set"""
+        if not (name and id):
+            return
+        key = name.lower()
+        if self._hashtags.get(key) == id:
+            return
+        self._remember(self._hashtags, key, id)
+        if self._db is not None:
+            self._pending_hashtags[key] = id
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._pending_users) + len(self._pending_hashtags) < self.flush_every:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Nothing to write in the background with, close() writes them
+            return
+        task = loop.create_task(self._flush_pending())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    def _take_pending(self) -> tuple[dict, dict]:
+        users, hashtags = self._pending_users, self._pending_hashtags
+        self._pending_users, self._pending_hashtags = {}, {}
+        return users, hashtags
+
+    def _write(self, users: dict, hashtags: dict):
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.executemany(
+                "INSERT OR REPLACE INTO users VALUES (?, ?, ?)",
+                [(k, *v) for k, v in users.items()],
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO hashtags VALUES (?, ?)", list(hashtags.items())
+            )
+            self._db.commit()
+
+    async def _flush_pending(self):
+        await asyncio.to_thread(self._write, *self._take_pending())
+
+    async def flush(self):
+        """Write waiting IDs to the database, including those already being written in the background"""
+        if self._db is None:
+            return
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+        await self._flush_pending()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's counters.
+
+        Returns:
+            dict: The hits, misses, users and hashtags held in memory.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "users": len(self._users),
+            "hashtags": len(self._hashtags),
+        }
+
+    def close(self):
+        """Write waiting IDs and close the database, await flush() first to avoid blocking the event loop"""
+        if self._db is not None:
+            self._write(*self._take_pending())
+            with self._lock:
+                self._db.close()
+                self._db = None
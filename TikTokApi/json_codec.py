@@ -0,0 +1,63 @@
+import asyncio
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def default_loads() -> Callable[[str], Any]:
+    """Returns the fastest installed JSON decoder, orjson then msgspec then the stdlib"""
+    if orjson is not None:
+        return orjson.loads
+    if msgspec is not None:
+        return msgspec.json.decode
+    return json.loads
+
+
+class JSONCodec:
+    """
+    Decodes TikTok's responses, moving large ones off the event loop.
+
+    Decoding a multi-megabyte response blocks every other coroutine while it
+    parses, so bodies of at least offload_threshold characters are decoded in
+    a worker thread instead.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.json_codec import JSONCodec
+
+            api = TikTokApi(json_codec=JSONCodec(offload_threshold=256_000))
+    """
+
+    def __init__(
+        self,
+        loads: Optional[Callable[[str], Any]] = None,
+        offload_threshold: Optional[int] = 1_000_000,
+    ):
+        """
+        Args:
+            loads (Callable[[str], Any]): The decoder to use, must raise a ValueError on invalid JSON. Defaults to the fastest installed one.
+            offload_threshold (int): The length of body from which to decode in a thread, never if None.
+        """
+        self.loads = loads if loads is not None else default_loads()
+        self.offload_threshold = offload_threshold
+
+    async def decode(self, text: str) -> Any:
+        """
+        Decode a JSON document.
+
+        Raises:
+            ValueError: If text isn't valid JSON.
+        """
+        if self.offload_threshold is not None and len(text) >= self.offload_threshold:
+            return await asyncio.to_thread(self.loads, text)
+        return self.loads(text)
@@ -0,0 +1,246 @@
+import bisect
+import functools
+import threading
+import time
+from typing import Optional
+
+# Upper bounds, in seconds, of the histogram buckets
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """Counts observations into buckets, like a Prometheus histogram"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # The last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Count a value"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-th quantile by interpolating within its bucket, None if nothing was observed"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def as_dict(self) -> dict:
+        """The cumulative bucket counts, sum, count and estimated p50, p90 and p99"""
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "buckets": buckets,
+            "sum": self.sum,
+            "count": self.count,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: tuple, **extra) -> str:
+    items = [*labels, *extra.items()]
+    if not items:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in items
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class Metrics:
+    """
+    Latency histograms and counters for the requests TikTokApi makes.
+
+    make_request records how long each attempt spent signing, fetching and
+    decoding, labelled by endpoint and session, along with counters of
+    requests, retries and failures by kind. Building User, Video, Sound,
+    Hashtag and Comment objects from TikTok's data is timed too, labelled by
+    model.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.metrics import Metrics
+
+            api = TikTokApi(metrics=Metrics())
+            ...
+            print(api.metrics.snapshot()["histograms"]["fetch"])
+            print(api.metrics.prometheus())
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, namespace: str = "tiktokapi"):
+        """
+        Args:
+            buckets (tuple): The upper bounds, in seconds, of the histogram buckets.
+            namespace (str): Prefixed to every metric's name in the Prometheus export.
+        """
+        self.buckets = buckets
+        self.namespace = namespace
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Add a duration to the histogram name with labels"""
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        """Add amount to the counter name with labels"""
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def gauge(self, name: str, value: float, **labels):
+        """Set the gauge name with labels to value"""
+        key = (name, _labels(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def snapshot(self) -> dict:
+        """
+        Returns every metric as plain data.
+
+        Returns:
+            dict: A histograms, a counters and a gauges dict, each mapping a metric's name to a list of its series, which have the series' labels and its values.
+        """
+        with self._lock:
+            histograms = {}
+            for (name, labels), histogram in self._histograms.items():
+                histograms.setdefault(name, []).append(
+                    {"labels": dict(labels), **histogram.as_dict()}
+                )
+            counters = {}
+            for (name, labels), value in self._counters.items():
+                counters.setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+            gauges = {}
+            for (name, labels), value in self._gauges.items():
+                gauges.setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+        return {"histograms": histograms, "counters": counters, "gauges": gauges}
+
+    def prometheus(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Histograms are named <namespace>_<name>_seconds, counters <namespace>_<name>_total and gauges <namespace>_<name>.
+        """
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._histograms}):
+                metric = f"{self.namespace}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for (series, labels), histogram in sorted(self._histograms.items()):
+                    if series != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(
+                        (*histogram.buckets, float("inf")), histogram.counts
+                    ):
+                        cumulative += count
+                        le = _format_labels(labels, le=_format_bound(bound))
+                        lines.append(f"{metric}_bucket{le} {cumulative}")
+                    lines.append(
+                        f"{metric}_sum{_format_labels(labels)} {histogram.sum}"
+                    )
+                    lines.append(
+                        f"{metric}_count{_format_labels(labels)} {histogram.count}"
+                    )
+
+            for name in sorted({name for name, _ in self._counters}):
+                metric = f"{self.namespace}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (series, labels), value in sorted(self._counters.items()):
+                    if series == name:
+                        lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+            for name in sorted({name for name, _ in self._gauges}):
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {metric} gauge")
+                for (series, labels), value in sorted(self._gauges.items()):
+                    if series == name:
+                        lines.append(f"{metric}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Forget every metric"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+def timed_model(model: str):
+    """
+    Time a model method that builds the object from TikTok's data, observed as the model histogram.
+
+    Nothing is recorded unless the TikTokApi the model belongs to has metrics.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            parent = getattr(type(self), "parent", None)
+            metrics = getattr(parent, "metrics", None)
+            if metrics is None:
+                return func(self, *args, **kwargs)
+
+            started_at = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                metrics.observe("model", time.perf_counter() - started_at, model=model)
+
+        return wrapper
+
+    return decorator
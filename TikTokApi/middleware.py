@@ -0,0 +1,54 @@
+import dataclasses
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+
+@dataclasses.dataclass
+class Request:
+    """A request passing through the middleware chain of make_request"""
+
+    url: str
+    """The url of the endpoint, without params."""
+    params: Optional[dict] = None
+    """The params of the request, msToken and X-Bogus are added later."""
+    headers: Optional[dict] = None
+    """The headers of the request, the session's are used if None."""
+    options: dict = dataclasses.field(default_factory=dict)
+    """The other arguments of make_request, ie. retries, coalesce and session_index."""
+
+    @property
+    def endpoint(self) -> str:
+        """The path of the url, ie. /api/user/detail/"""
+        return urlparse(self.url).path
+
+
+Handler = Callable[[Request], Awaitable[Any]]
+"""Makes a request, returning the decoded response."""
+
+Middleware = Callable[[Request, Handler], Awaitable[Any]]
+"""
+Gets a request and the next handler, returning the decoded response.
+
+A middleware can change the request before passing it on with
+``await call_next(request)``, change the response it gets back, or return a
+response without calling call_next at all.
+"""
+
+
+def compose(middleware: list[Middleware], handler: Handler) -> Handler:
+    """
+    Chain middleware around a handler, the first middleware is the outermost.
+
+    Returns:
+        Handler: Runs the request through every middleware and then the handler.
+    """
+    for m in reversed(middleware):
+        handler = _link(m, handler)
+    return handler
+
+
+def _link(middleware: Middleware, call_next: Handler) -> Handler:
+    async def handle(request: Request):
+        return await middleware(request, call_next)
+
+    return handle
@@ -0,0 +1,206 @@
+import asyncio
+import time
+from typing import Hashable, Optional
+
+from .retry import EMPTY_RESPONSE, STATUS_CODE
+
+
+class AdaptiveTokenBucket:
+    """
+    A token bucket whose rate halves when TikTok pushes back and creeps back up while it doesn't.
+
+    Requests reserve a token up front, so concurrent callers queue behind
+    each other instead of all waking at once when tokens refill.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        min_rate: Optional[float] = None,
+        decrease: float = 0.5,
+        recovery: float = 0.02,
+        cooldown: float = 5.0,
+    ):
+        """
+        Args:
+            rate (float): The most requests per second, and the rate to start at.
+            burst (float): The most requests that can be made at once after being idle.
+            min_rate (float): The rate never drops below this, defaults to a tenth of rate.
+            decrease (float): The rate is multiplied by this when TikTok pushes back.
+            recovery (float): The fraction of rate added back for every clean response.
+            cooldown (float): The seconds after slowing down before it can slow down again, so one bad burst only counts once.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.decrease = decrease
+        self.recovery = recovery
+        self.cooldown = cooldown
+        self.tokens = burst
+        self.slowdowns = 0
+        self._updated_at = time.monotonic()
+        self._slowed_at = None
+
+    def reserve(self) -> float:
+        """Take a token, returning the seconds to wait before using it"""
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def slow_down(self):
+        """TikTok pushed back, cut the rate unless it was just cut"""
+        now = time.monotonic()
+        if self._slowed_at is not None and now - self._slowed_at < self.cooldown:
+            return
+        self._slowed_at = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.slowdowns += 1
+
+    def speed_up(self):
+        """A clean response, move the rate back towards max_rate"""
+        self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+    def as_dict(self) -> dict:
+        return {
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "tokens": self.tokens,
+            "slowdowns": self.slowdowns,
+        }
+
+
+class RateLimiter:
+    """
+    Paces requests per endpoint and per session to stay within what TikTok tolerates.
+
+    Each endpoint with a rate and each session gets its own adaptive token
+    bucket. A request waits for a token from its endpoint's bucket before
+    picking a session, then for one from the session's bucket. When a
+    response is empty or has a non-zero status_code both buckets slow down,
+    and every clean response speeds them back up a little.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.rate_limit import RateLimiter
+
+            api = TikTokApi(
+                rate_limiter=RateLimiter(
+                    endpoint_rates={"/api/comment/list/": 2, "/api/post/item_list/": 5},
+                    session_rate=3,
+                )
+            )
+    """
+
+    def __init__(
+        self,
+        endpoint_rates: Optional[dict] = None,
+        default_endpoint_rate: Optional[float] = None,
+        session_rate: Optional[float] = None,
+        burst: float = 1.0,
+        decrease: float = 0.5,
+        recovery: float = 0.02,
+        cooldown: float = 5.0,
+        slow_down_on: tuple = (EMPTY_RESPONSE, STATUS_CODE),
+    ):
+        """
+        Args:
+            endpoint_rates (dict): The most requests per second to each endpoint, keyed by url path.
+            default_endpoint_rate (float): The most requests per second to endpoints missing from endpoint_rates, unlimited if None.
+            session_rate (float): The most requests per second each session makes, unlimited if None.
+            burst (float): The most requests a bucket allows at once after being idle.
+            decrease (float): A bucket's rate is multiplied by this when TikTok pushes back.
+            recovery (float): The fraction of a bucket's rate added back for every clean response.
+            cooldown (float): The seconds after slowing down before a bucket can slow down again.
+            slow_down_on (tuple): The kinds of failures, from TikTokApi.retry, that mean TikTok is pushing back.
+        """
+        self.endpoint_rates = endpoint_rates or {}
+        self.default_endpoint_rate = default_endpoint_rate
+        self.session_rate = session_rate
+        self.burst = burst
+        self.decrease = decrease
+        self.recovery = recovery
+        self.cooldown = cooldown
+        self.slow_down_on = slow_down_on
+        self.waited = 0.0
+        self._endpoints = {}
+        self._sessions = {}
+
+    def _bucket(
+        self, buckets: dict, key: Hashable, rate: Optional[float]
+    ) -> Optional[AdaptiveTokenBucket]:
+        bucket = buckets.get(key)
+        if bucket is None and rate is not None:
+            bucket = buckets[key] = AdaptiveTokenBucket(
+                rate,
+                burst=self.burst,
+                decrease=self.decrease,
+                recovery=self.recovery,
+                cooldown=self.cooldown,
+            )
+        return bucket
+
+    def _endpoint_bucket(self, endpoint: str) -> Optional[AdaptiveTokenBucket]:
+        return self._bucket(
+            self._endpoints,
+            endpoint,
+            self.endpoint_rates.get(endpoint, self.default_endpoint_rate),
+        )
+
+    def _session_bucket(self, session: int) -> Optional[AdaptiveTokenBucket]:
+        return self._bucket(self._sessions, session, self.session_rate)
+
+    async def _wait(self, bucket: Optional[AdaptiveTokenBucket]):
+        if bucket is None:
+            return
+        delay = bucket.reserve()
+        if delay > 0:
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+    async def wait_for_endpoint(self, endpoint: str):
+        """Wait until a request can be sent to endpoint"""
+        await self._wait(self._endpoint_bucket(endpoint))
+
+    async def wait_for_session(self, session: int):
+        """Wait until the session at index session can send a request"""
+        await self._wait(self._session_bucket(session))
+
+    def record(self, endpoint: str, session: Optional[int], kind: Optional[str]):
+        """
+        Adapt to the outcome of a request.
+
+        Args:
+            endpoint (str): The url path the request was sent to.
+            session (int): The index of the session that sent it, if it got one.
+            kind (str): The kind of failure from TikTokApi.retry.classify_failure, None if the response was clean.
+        """
+        buckets = [self._endpoints.get(endpoint)]
+        if session is not None:
+            buckets.append(self._sessions.get(session))
+        for bucket in buckets:
+            if bucket is None:
+                continue
+            if kind is None:
+                bucket.speed_up()
+            elif kind in self.slow_down_on:
+                bucket.slow_down()
+
+    def stats(self) -> dict:
+        """
+        Returns the state of every bucket.
+
+        Returns:
+            dict: The seconds spent waiting in total, and the rate, max_rate, tokens and slowdowns of each endpoint's and session's bucket.
+        """
+        return {
+            "waited": self.waited,
+            "endpoints": {k: b.as_dict() for k, b in self._endpoints.items()},
+            "sessions": {k: b.as_dict() for k, b in self._sessions.items()},
+        }
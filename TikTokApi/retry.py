@@ -0,0 +1,150 @@
+import asyncio
+import dataclasses
+import random
+import time
+from typing import Optional
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .exceptions import (
+    EmptyResponseException,
+    InvalidJSONException,
+    StatusCodeException,
+)
+
+EMPTY_RESPONSE = "empty_response"
+INVALID_JSON = "invalid_json"
+STATUS_CODE = "status_code"
+TIMEOUT = "timeout"
+PAGE_CRASH = "page_crash"
+CONNECTION = "connection"
+
+# Messages Playwright uses when the page or its browser went away mid request
+_PAGE_CRASH_MESSAGES = ("crash", "Target closed", "has been closed")
+
+
+def classify_failure(e: Exception) -> Optional[str]:
+    """
+    Sort an exception raised while making a request into a kind of failure.
+
+    Returns:
+        str: One of the failure kinds in TikTokApi.retry, or None if the exception isn't a request failure.
+    """
+    if isinstance(e, EmptyResponseException):
+        return EMPTY_RESPONSE
+    if isinstance(e, InvalidJSONException):
+        return INVALID_JSON
+    if isinstance(e, StatusCodeException):
+        return STATUS_CODE
+    if isinstance(e, (PlaywrightTimeoutError, asyncio.TimeoutError, TimeoutError)):
+        return TIMEOUT
+    if isinstance(e, PlaywrightError):
+        message = str(e)
+        if "Timed out" in message:
+            return TIMEOUT
+        if any(m in message for m in _PAGE_CRASH_MESSAGES):
+            return PAGE_CRASH
+        return None
+    if isinstance(e, ConnectionError):
+        return CONNECTION
+    return None
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of requests so they can't multiply load during an incident.
+
+    Every request deposits ratio of a retry into the budget, and the budget
+    also refills by min_per_second on its own so low traffic can still retry.
+    A retry is only allowed while there's a whole retry left to spend.
+    """
+
+    def __init__(
+        self, ratio: float = 0.1, min_per_second: float = 1.0, max_balance: float = 10.0
+    ):
+        """
+        Args:
+            ratio (float): The retries earned per request.
+            min_per_second (float): The retries earned per second regardless of traffic.
+            max_balance (float): The most retries that can be saved up.
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self.balance = max_balance
+        self.exhausted = 0
+        self._updated_at = time.monotonic()
+
+    def _refill(self, amount: float):
+        now = time.monotonic()
+        amount += (now - self._updated_at) * self.min_per_second
+        self._updated_at = now
+        self.balance = min(self.max_balance, self.balance + amount)
+
+    def record_request(self):
+        """Earn ratio of a retry for a new request"""
+        self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        """Spend a retry, returning False if the budget is exhausted"""
+        self._refill(0)
+        if self.balance < 1:
+            self.exhausted += 1
+            return False
+        self.balance -= 1
+        return True
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """
+    Decides which failed requests are retried, how long to wait and on which session.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.retry import RetryPolicy, RetryBudget, TIMEOUT
+
+            api = TikTokApi(retry_policy=RetryPolicy(max_attempts=5, retry_on=(TIMEOUT,), budget=RetryBudget(ratio=0.2)))
+    """
+
+    max_attempts: int = 3
+    """The most times a request is tried, including the first attempt."""
+    backoff: float = 1.0
+    """The seconds to wait before the first retry."""
+    max_backoff: float = 30.0
+    """The most seconds to wait between attempts."""
+    exponential_backoff: bool = True
+    """Whether to double the wait after every attempt."""
+    jitter: float = 0.5
+    """The fraction of each wait that is randomized to spread retries out."""
+    retry_on: tuple = (
+        EMPTY_RESPONSE,
+        INVALID_JSON,
+        STATUS_CODE,
+        TIMEOUT,
+        PAGE_CRASH,
+        CONNECTION,
+    )
+    """The kinds of failures that are retried."""
+    switch_session: bool = True
+    """Whether to retry on a different session than the one that failed."""
+    budget: Optional[RetryBudget] = None
+    """A budget shared by every request using the policy, retries are unlimited if None."""
+    attempt_timeout: Optional[float] = 60.0
+    """The most seconds an attempt may spend signing and fetching once it has a session before failing as a timeout, unlimited if None."""
+
+    def should_retry(self, kind: Optional[str], attempt: int) -> bool:
+        """Whether a request that failed with kind on its attempt-th try should be retried"""
+        if kind not in self.retry_on or attempt >= self.max_attempts:
+            return False
+        return self.budget is None or self.budget.try_spend()
+
+    def delay(self, attempt: int) -> float:
+        """The seconds to wait after the attempt-th try failed"""
+        delay = self.backoff
+        if self.exponential_backoff:
+            delay *= 2 ** (attempt - 1)
+        delay = min(delay, self.max_backoff)
+        return delay * (1 - self.jitter * random.random())
@@ -0,0 +1,291 @@
+import asyncio
+import contextlib
+import dataclasses
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Optional
+
+from .retry import CONNECTION, EMPTY_RESPONSE, PAGE_CRASH, TIMEOUT, classify_failure
+
+# Priorities of requests, lower ones are handed a session first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BULK = 2
+
+
+@dataclasses.dataclass
+class SessionStats:
+    """Load and health counters for a single TikTokPlaywrightSession"""
+
+    in_flight: int = 0
+    """Requests currently running on the session."""
+    requests: int = 0
+    """Total requests completed on the session."""
+    errors: int = 0
+    """Total requests that raised on the session."""
+    consecutive_errors: int = 0
+    """Errors since the last successful request."""
+    latency: Optional[float] = None
+    """Exponentially weighted moving average of request latency in seconds."""
+    last_error_at: Optional[float] = None
+    """time.monotonic() of the most recent error."""
+
+    def as_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+class SessionPool:
+    """
+    Hands out the least loaded healthy session instead of a random one.
+
+    A session is unhealthy once it has failed max_consecutive_errors times in a
+    row, and stays that way until error_cooldown seconds pass without another
+    error. Unhealthy sessions are only used when every session is unhealthy.
+    Only failures of the session itself count, a request TikTok answered with
+    an error, like a missing or private user, doesn't.
+
+    When max_concurrency is set no session runs more than that many requests at
+    once, callers over the limit queue until a slot frees up. A batch of
+    requests run at once takes a slot for each of them. Queued callers
+    are handed slots in order of priority, and a caller's priority rises by
+    aging every second it waits so bulk requests are never starved by a
+    steady stream of interactive ones.
+
+    Example Usage:
+        .. code-block:: python
+
+            async with api.session_pool.acquire() as (i, session):
+                await session.page.evaluate("() => 1")
+
+            for stats in api.session_pool.stats():
+                print(stats["in_flight"], stats["latency"])
+    """
+
+    def __init__(
+        self,
+        latency_alpha: float = 0.2,
+        max_consecutive_errors: int = 3,
+        error_cooldown: float = 30.0,
+        max_concurrency: Optional[int] = None,
+        aging: float = 0.1,
+        session_failures: tuple = (EMPTY_RESPONSE, TIMEOUT, PAGE_CRASH, CONNECTION),
+    ):
+        """
+        Args:
+            latency_alpha (float): The weight given to the newest sample in the latency average.
+            max_consecutive_errors (int): The amount of errors in a row after which a session is unhealthy.
+            error_cooldown (float): The seconds an unhealthy session is avoided for.
+            max_concurrency (int): The most requests a single session may run at once, unlimited if None.
+            aging (float): How much a queued caller's priority rises per second, so a bulk request waiting 20 seconds goes before a new interactive one by default.
+            session_failures (tuple): The kinds of failures, from TikTokApi.retry, that count as errors of the session.
+        """
+        self.sessions = []
+        self.latency_alpha = latency_alpha
+        self.max_consecutive_errors = max_consecutive_errors
+        self.error_cooldown = error_cooldown
+        self.max_concurrency = max_concurrency
+        self.aging = aging
+        self.session_failures = session_failures
+        self._waiters = []
+        self._order = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        """The amount of callers waiting for a free slot"""
+        return len(self._waiters)
+
+    def is_healthy(self, session: Any) -> bool:
+        """Whether a session should be picked for new requests"""
+        stats = session.stats
+        if stats.consecutive_errors < self.max_consecutive_errors:
+            return True
+        return time.monotonic() - stats.last_error_at >= self.error_cooldown
+
+    def _load(self, session: Any) -> tuple:
+        stats = session.stats
+        return (
+            not self.is_healthy(session),
+            stats.in_flight,
+            stats.latency if stats.latency is not None else 0.0,
+        )
+
+    def select(self, session_index: Optional[int] = None, exclude=()):
+        """
+        Pick a session.
+
+        Args:
+            session_index (int): The index of the session you want to use, if not provided the least loaded session is used.
+            exclude (Iterable[int]): Session indexes to avoid unless they're the only ones left.
+
+        Returns:
+            int: The index of the session.
+            TikTokPlaywrightSession: The session.
+        """
+        if session_index is not None:
+            return session_index, self.sessions[session_index]
+        if len(self.sessions) == 0:
+            raise Exception("No sessions created, please create sessions first")
+
+        candidates = [i for i in range(len(self.sessions)) if i not in exclude]
+        if len(candidates) == 0:
+            candidates = list(range(len(self.sessions)))
+        # Shuffle so ties don't always land on the first session
+        random.shuffle(candidates)
+        i = min(candidates, key=lambda i: self._load(self.sessions[i]))
+        return i, self.sessions[i]
+
+    def _has_capacity(self, session: Any, weight: int = 1) -> bool:
+        return (
+            self.max_concurrency is None
+            or session.stats.in_flight + weight <= self.max_concurrency
+        )
+
+    def _find_slot(
+        self,
+        session_index: Optional[int],
+        exclude,
+        strict: bool = False,
+        weight: int = 1,
+    ) -> Optional[int]:
+        if session_index is not None:
+            if self._has_capacity(self.sessions[session_index], weight):
+                return session_index
+            return None
+
+        free = [i for i, s in enumerate(self.sessions) if self._has_capacity(s, weight)]
+        preferred = [i for i in free if i not in exclude]
+        if len(preferred) > 0 or strict:
+            free = preferred
+        if len(free) == 0:
+            return None
+        random.shuffle(free)
+        return min(free, key=lambda i: self._load(self.sessions[i]))
+
+    def has_free_slot(self, exclude=()) -> bool:
+        """Whether a session other than those in exclude could take a request without queueing"""
+        return self._find_slot(None, exclude, strict=True) is not None
+
+    def _dispatch(self):
+        """Hand free slots to waiters, highest aged priority first"""
+        skipped = []
+        while self._waiters:
+            if not any(self._has_capacity(s) for s in self.sessions):
+                break
+            waiter = heapq.heappop(self._waiters)
+            _, _, session_index, exclude, strict, weight, future = waiter
+            if future.done():
+                continue
+            i = self._find_slot(session_index, exclude, strict, weight)
+            if i is None:
+                # Waiting on a busy pinned session or for room for a batch, let others past
+                skipped.append(waiter)
+                continue
+            self.sessions[i].stats.in_flight += weight
+            future.set_result(i)
+        for waiter in skipped:
+            heapq.heappush(self._waiters, waiter)
+
+    def _release(self, i: int, weight: int = 1):
+        self.sessions[i].stats.in_flight -= weight
+        self._dispatch()
+
+    async def _wait_for_slot(
+        self,
+        session_index: Optional[int],
+        exclude,
+        priority: float,
+        strict: bool,
+        weight: int = 1,
+    ) -> int:
+        if len(self.sessions) == 0:
+            raise Exception("No sessions created, please create sessions first")
+
+        future = asyncio.get_running_loop().create_future()
+        # Aging by (now - enqueued) * aging is the same for every waiter at a
+        # given moment, so ordering by priority + enqueued * aging never changes
+        rank = priority + time.monotonic() * self.aging
+        waiter = (
+            rank,
+            next(self._order),
+            session_index,
+            exclude,
+            strict,
+            weight,
+            future,
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(future.result(), weight)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    @contextlib.asynccontextmanager
+    async def acquire(
+        self,
+        session_index: Optional[int] = None,
+        exclude=(),
+        priority: float = PRIORITY_DEFAULT,
+        strict: bool = False,
+        weight: int = 1,
+    ):
+        """
+        Reserve a slot on a session for as long as the context is open.
+
+        Args:
+            session_index (int): The index of the session you want to use, if not provided the least loaded session is used.
+            exclude (Iterable[int]): Session indexes to avoid if another session has a free slot.
+            priority (float): Where the caller queues if every slot is taken, lower goes first, see PRIORITY_INTERACTIVE and PRIORITY_BULK.
+            strict (bool): Never use a session in exclude, waiting for a slot on another session instead.
+            weight (int): How many slots to reserve, the number of requests a batch runs at once. It must not exceed max_concurrency.
+
+        Yields:
+            int: The index of the session.
+            TikTokPlaywrightSession: The session.
+        """
+        i = await self._wait_for_slot(session_index, exclude, priority, strict, weight)
+        session = self.sessions[i]
+        stats = session.stats
+        start = time.monotonic()
+        try:
+            yield i, session
+        except Exception as e:
+            if classify_failure(e) in self.session_failures:
+                stats.errors += 1
+                stats.consecutive_errors += 1
+                stats.last_error_at = time.monotonic()
+            else:
+                self._record_success(stats, start)
+            raise
+        else:
+            self._record_success(stats, start)
+        finally:
+            stats.requests += weight
+            self._release(i, weight)
+
+    def _record_success(self, stats: SessionStats, start: float):
+        elapsed = time.monotonic() - start
+        if stats.latency is None:
+            stats.latency = elapsed
+        else:
+            stats.latency += self.latency_alpha * (elapsed - stats.latency)
+        stats.consecutive_errors = 0
+
+    def stats(self) -> list[dict]:
+        """
+        Returns the counters of every session.
+
+        Returns:
+            list[dict]: One dict per session, in session index order, with a healthy key added.
+        """
+        return [
+            {**session.stats.as_dict(), "healthy": self.is_healthy(session)}
+            for session in self.sessions
+        ]
@@ -0,0 +1,49 @@
+import json
+import os
+import time
+from typing import Optional
+
+SNAPSHOT_VERSION = 1
+
+
+def read_snapshot(path: str, max_age: Optional[float] = None) -> list[dict]:
+    """
+    Read the session snapshots saved at path.
+
+    Args:
+        path (str): The file the snapshots were saved to.
+        max_age (float): The most seconds since the snapshots were saved for them to still be used, no limit if None.
+
+    Returns:
+        list[dict]: The usable session snapshots, empty if the file is missing, stale or unreadable.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return []
+    if max_age is not None and time.time() - data.get("created_at", 0) > max_age:
+        return []
+    return [s for s in data.get("sessions", []) if s.get("ms_token") is not None]
+
+
+def write_snapshot(path: str, sessions: list[dict]):
+    """
+    Atomically save session snapshots to path.
+
+    Args:
+        path (str): The file to save the snapshots to.
+        sessions (list[dict]): One dict per session with its storage_state, ms_token, headers, params, base_url and proxy.
+    """
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": time.time(),
+        "sessions": sessions,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
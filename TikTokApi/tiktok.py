@@ -1,15 +1,32 @@
 import asyncio
+import contextlib
 import logging
 import dataclasses
-from typing import Any
+import functools
+from typing import Any, Optional
 import random
-import time
 import json
+import time
 
 from playwright.async_api import async_playwright
 from urllib.parse import urlencode, quote, urlparse
 from .stealth import stealth_async
-from .helpers import random_choice
+from .helpers import random_choice, request_key, status_code_exception
+from .session_pool import PRIORITY_DEFAULT, SessionPool, SessionStats
+from .transport import HTTPTransport
+from .snapshot import read_snapshot, write_snapshot
+from .retry import RetryBudget, RetryPolicy, classify_failure
+from .json_codec import JSONCodec
+from .cache import NegativeCache, ResponseCache, SQLiteResponseCache
+from .identifiers import IdentifierCache
+from .cassette import Cassette
+from .metrics import Metrics
+from .tracing import Span, Tracer
+from .middleware import Middleware, Request, compose
+from .rate_limit import RateLimiter
+from .concurrency import ConcurrencyController
+from .circuit_breaker import CircuitBreakers
+from .hedging import Hedging
 
 from .api.user import User
 from .api.video import Video
@@ -22,8 +39,98 @@ from .api.search import Search
 from .exceptions import (
     InvalidJSONException,
     EmptyResponseException,
+    CircuitOpenException,
+    TikTokException,
 )
 
+# Installed on every page with add_init_script so each request is signed and
+# fetched by a single evaluate call of an already compiled function.
+_BRIDGE_JS = """
+Object.defineProperty(window, "__tiktokApiSignedFetch", {
+    enumerable: false,
+    value: async (url, headers, timeout, timings) => {
+        const startedAt = performance.now();
+        const deadline = Date.now() + timeout;
+        while (window.byted_acrawler === undefined) {
+            if (Date.now() > deadline) {
+                throw new Error("Timed out waiting for byted_acrawler");
+            }
+            await new Promise((resolve) => setTimeout(resolve, 50));
+        }
+        const readyAt = performance.now();
+        const xBogus = window.byted_acrawler.frontierSign(url)["X-Bogus"];
+        if (xBogus === undefined) {
+            throw new Error("Failed to generate X-Bogus");
+        }
+        const signedUrl = url + (url.includes("?") ? "&" : "?") + "X-Bogus=" + xBogus;
+        const signedAt = performance.now();
+        const response = await fetch(signedUrl, { method: "GET", headers: headers });
+        const body = await response.text();
+        if (timings !== undefined) {
+            timings.wait_signer = readyAt - startedAt;
+            timings.sign = signedAt - readyAt;
+            timings.fetch = performance.now() - signedAt;
+        }
+        return body;
+    },
+});
+"""
+
+_SIGNED_FETCH_JS = """
+([url, headers, timeout]) => window.__tiktokApiSignedFetch(url, headers, timeout)
+"""
+
+_SIGNED_FETCH_TIMED_JS = """
+([url, headers, timeout]) => {
+    const timings = {};
+    return window.__tiktokApiSignedFetch(url, headers, timeout, timings)
+        .then((body) => [body, timings.wait_signer, timings.sign, timings.fetch]);
+}
+"""
+_SIGNED_FETCH_MANY_JS = """
+([requests, timeout]) => Promise.all(requests.map(([url, headers]) =>
+    window.__tiktokApiSignedFetch(url, headers, timeout)
+        .then((body) => [body, null])
+        .catch((error) => [null, error.message])
+))
+"""
+
+_SIGN_URL_JS = """
+(url) => window.byted_acrawler.frontierSign(url)
+"""
+
+_FETCH_JS = """
+([url, headers]) => fetch(url, { method: "GET", headers: headers })
+    .then((response) => response.text())
+    .catch((error) => Promise.reject(error.message))
+"""
+
+_SIGN_URLS_JS = """
+(urls) => urls.map((url) => window.byted_acrawler.frontierSign(url)["X-Bogus"])
+"""
+
+_FETCH_URLS_JS = """
+(requests) => Promise.all(requests.map(([url, headers]) =>
+    fetch(url, { method: "GET", headers: headers })
+        .then((response) => response.text())
+        .then((body) => [body, null])
+        .catch((error) => [null, error.message])
+))
+"""
+
+
+@dataclasses.dataclass
+class _Attempt:
+    """What happened during one try at a request, kept even if it raises"""
+
+    timings: Optional[dict]
+    started_at: float = dataclasses.field(default_factory=time.perf_counter)
+    session_index: Optional[int] = None
+    acquired_at: Optional[float] = None
+    acquired: asyncio.Event = dataclasses.field(default_factory=asyncio.Event)
+    body: Optional[str] = None
+    elapsed: Optional[float] = None
+
 
 @dataclasses.dataclass
 class TikTokPlaywrightSession:
@@ -36,6 +143,38 @@ class TikTokPlaywrightSession:
     headers: dict = None
     ms_token: str = None
     base_url: str = "https://www.tiktok.com"
+    stats: SessionStats = dataclasses.field(default_factory=SessionStats)
+    signer_ready: bool = False
+    bridge_installed: bool = False
+    _encoded_params: dict = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name, value):
+        if name == "params" and "_encoded_params" in self.__dict__:
+            self._encoded_params.clear()
+        super().__setattr__(name, value)
+
+    def encoded_params(self, exclude: frozenset = frozenset()) -> str:
+        """
+        The url encoded session params, leaving out the keys in exclude.
+
+        The result is cached until params is reassigned, call
+        invalidate_encoded_params after changing params in place.
+        """
+        encoded = self._encoded_params.get(exclude)
+        if encoded is None:
+            params = self.params if self.params is not None else {}
+            encoded = urlencode(
+                {k: v for k, v in params.items() if k not in exclude},
+                quote_via=quote,
+            )
+            self._encoded_params[exclude] = encoded
+        return encoded
+
+    def invalidate_encoded_params(self):
+        """Drop the cached encoded params"""
+        self._encoded_params.clear()
 
 
 class TikTokApi:
@@ -56,15 +195,82 @@ class TikTokApi:
     trending = Trending
     search = Search
 
-    def __init__(self, logging_level: int = logging.WARN, logger_name: str = None):
+    def __init__(
+        self,
+        logging_level: int = logging.WARN,
+        logger_name: str = None,
+        retry_policy: RetryPolicy = None,
+        json_codec: JSONCodec = None,
+        coalesce_requests: bool = True,
+        response_cache: ResponseCache = None,
+        disk_cache: SQLiteResponseCache = None,
+        negative_cache: NegativeCache = None,
+        identifier_cache: IdentifierCache = None,
+        cassette: Cassette = None,
+        metrics: Metrics = None,
+        tracer: Tracer = None,
+        middleware: list[Middleware] = None,
+        rate_limiter: RateLimiter = None,
+        concurrency: ConcurrencyController = None,
+        circuit_breakers: CircuitBreakers = None,
+        hedging: Hedging = None,
+        signer_timeout: float = 30.0,
+    ):
         """
         Create a TikTokApi object.
 
         Args:
             logging_level (int): The logging level you want to use.
             logger_name (str): The name of the logger you want to use.
+            retry_policy (RetryPolicy): Which failed requests to retry and how, defaults to 3 attempts with jittered exponential backoff and a shared retry budget.
+            json_codec (JSONCodec): How to decode responses, defaults to the fastest installed JSON library and decoding bodies over 1MB in a thread.
+            coalesce_requests (bool): Whether concurrent requests for the same url and params share one request to TikTok.
+            response_cache (ResponseCache): A cache for the responses of info() calls, responses aren't cached if None.
+            disk_cache (SQLiteResponseCache): A cache on disk for the responses of every endpoint, it's checked after the response_cache.
+            negative_cache (NegativeCache): Remembers users, videos and sounds that are missing or private, they're requested every time if None.
+            identifier_cache (IdentifierCache): Remembers the IDs of users and hashtags to skip info() calls, defaults to one in memory.
+            cassette (Cassette): Records TikTok's responses to a file, or replays them without creating any sessions.
+            metrics (Metrics): Records latency histograms and counters of requests, nothing is recorded if None.
+            tracer (Tracer): Records a span for every stage of each request, nothing is recorded if None.
+            middleware (list[Middleware]): Middleware every make_request call goes through, in order, see add_middleware.
+            rate_limiter (RateLimiter): Paces requests per endpoint and per session, slowing down when TikTok pushes back. Requests aren't paced if None.
+            concurrency (ConcurrencyController): Limits how many requests are in flight at once, adapting the limit to latency and errors. Unlimited if None.
+            circuit_breakers (CircuitBreakers): Fails requests to an endpoint fast while too many of its recent requests failed, requests are always sent if None.
+            hedging (Hedging): Sends a duplicate of slow requests on another session and uses the first response, requests aren't hedged if None.
+            signer_timeout (float): The most seconds a request waits for TikTok's signing script to load on its session.
         """
-        self.sessions = []
+        self.session_pool = SessionPool()
+        self.sessions = self.session_pool.sessions
+        self.signer_timeout = signer_timeout
+        self.transport = None
+        self.playwright = None
+        self.browser = None
+        if retry_policy is None:
+            retry_policy = RetryPolicy(budget=RetryBudget())
+        self.retry_policy = retry_policy
+        self.json_codec = json_codec if json_codec is not None else JSONCodec()
+        self.coalesce_requests = coalesce_requests
+        self._in_flight_requests = {}
+        self.response_cache = response_cache
+        self.disk_cache = disk_cache
+        self.negative_cache = negative_cache
+        self.identifier_cache = (
+            identifier_cache if identifier_cache is not None else IdentifierCache()
+        )
+        self.cassette = cassette
+        self.metrics = metrics
+        self.tracer = tracer
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        if concurrency is not None:
+            concurrency.metrics = metrics
+        self.circuit_breakers = circuit_breakers
+        self.hedging = hedging
+        self.middleware = []
+        for m in middleware or []:
+            self.add_middleware(m)
+        self._revalidating = set()
+        self._background_tasks = set()
 
         if logger_name is None:
             logger_name = __name__
@@ -77,6 +283,7 @@ class TikTokApi:
         Comment.parent = self
         Trending.parent = self
         Search.parent = self
+        Tracer.active = tracer
 
     def __create_logger(self, name: str, level: int = logging.DEBUG):
         """Create a logger for the class."""
@@ -143,15 +350,24 @@ class TikTokApi:
         sleep_after: int = 1,
         cookies: dict = None,
         suppress_resource_load_types: list[str] = None,
+        snapshot: dict = None,
     ):
-        """Create a TikTokPlaywrightSession"""
+        """Create a TikTokPlaywrightSession, restoring it from a snapshot if given"""
+        if snapshot is not None:
+            url = snapshot["base_url"]
+            proxy = snapshot["proxy"]
+            context_options = {
+                **context_options,
+                "storage_state": snapshot["storage_state"],
+            }
+
         if ms_token is not None:
             if cookies is None:
                 cookies = {}
             cookies["msToken"] = ms_token
 
         context = await self.browser.new_context(proxy=proxy, **context_options)
-        if cookies is not None:
+        if cookies is not None and snapshot is None:
             formatted_cookies = [
                 {"name": k, "value": v, "domain": urlparse(url).netloc, "path": "/"}
                 for k, v in cookies.items()
@@ -160,6 +376,7 @@ class TikTokApi:
             await context.add_cookies(formatted_cookies)
         page = await context.new_page()
         await stealth_async(page)
+        await page.add_init_script(_BRIDGE_JS)
 
         # Get the request headers to the url
         request_headers = None
@@ -168,7 +385,8 @@ class TikTokApi:
             nonlocal request_headers
             request_headers = request.headers
 
-        page.once("request", handle_request)
+        if snapshot is None:
+            page.once("request", handle_request)
 
         if suppress_resource_load_types is not None:
             await page.route(
@@ -178,6 +396,23 @@ class TikTokApi:
                 else route.continue_(),
             )
 
+        if snapshot is not None:
+            # The snapshot already has the msToken, headers and params, only the
+            # signing script needs the page, and the bridge waits for it to load
+            await page.goto(url, wait_until="commit")
+            session = TikTokPlaywrightSession(
+                context,
+                page,
+                ms_token=snapshot["ms_token"],
+                proxy=proxy,
+                params=snapshot["params"],
+                headers=snapshot["headers"],
+                base_url=url,
+                bridge_installed=True,
+            )
+            self.sessions.append(session)
+            return
+
         await page.goto(url)
 
         session = TikTokPlaywrightSession(
@@ -187,11 +422,10 @@ class TikTokApi:
             proxy=proxy,
             headers=request_headers,
             base_url=url,
+            bridge_installed=True,
         )
         if ms_token is None:
-            time.sleep(sleep_after)  # TODO: Find a better way to wait for msToken
-            cookies = await self.get_session_cookies(session)
-            ms_token = cookies.get("msToken")
+            ms_token = await self.__wait_for_ms_token(session, timeout=sleep_after)
             session.ms_token = ms_token
             if ms_token is None:
                 self.logger.info(
@@ -200,6 +434,24 @@ class TikTokApi:
         self.sessions.append(session)
         await self.__set_session_params(session)
 
+    async def __wait_for_ms_token(
+        self,
+        session: TikTokPlaywrightSession,
+        timeout: float,
+        poll_interval: float = 0.1,
+    ):
+        """Wait until TikTok sets the msToken cookie, returning None if it doesn't within timeout seconds"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            cookies = await self.get_session_cookies(session)
+            ms_token = cookies.get("msToken")
+            if ms_token is not None:
+                return ms_token
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(poll_interval, remaining))
+
     async def create_sessions(
         self,
         num_sessions=5,
@@ -212,6 +464,10 @@ class TikTokApi:
         override_browser_args: list[dict] = None,
         cookies: list[dict] = None,
         suppress_resource_load_types: list[str] = None,
+        max_concurrency_per_session: int = None,
+        transport: HTTPTransport = None,
+        snapshot_path: str = None,
+        snapshot_max_age: float = 3600,
     ):
         """
         Create sessions for use within the TikTokApi class.
@@ -224,12 +480,16 @@ class TikTokApi:
             ms_tokens (list[str]): A list of msTokens to use for the sessions, you can get these from your cookies after visiting TikTok.
                                    If you don't provide any, the sessions will try to get them themselves, but this is not guaranteed to work.
             proxies (list): A list of proxies to use for the sessions
-            sleep_after (int): The amount of time to sleep after creating a session, this is to allow the msToken to be generated.
+            sleep_after (int): The most time to wait for TikTok to generate the msToken of a session without one, sessions stop waiting as soon as it's set.
             starting_url (str): The url to start the sessions on, this is usually https://www.tiktok.com.
             context_options (dict): Options to pass to the playwright context.
             override_browser_args (list[dict]): A list of dictionaries containing arguments to pass to the browser.
             cookies (list[dict]): A list of cookies to use for the sessions, you can get these from your cookies after visiting TikTok.
             suppress_resource_load_types (list[str]): Types of resources to suppress playwright from loading, excluding more types will make playwright faster.. Types: document, stylesheet, image, media, font, script, textrack, xhr, fetch, eventsource, websocket, manifest, other.
+            max_concurrency_per_session (int): The most requests a single session may run at once, requests over the limit wait for a free session. Unlimited if None.
+            transport (HTTPTransport): Send signed requests through this HTTP client instead of the browser's fetch, the browser is then only used for signing and cookies.
+            snapshot_path (str): A file to restore sessions from, skipping the msToken wait and session param lookups. If it doesn't hold enough fresh sessions the missing ones are created normally and all sessions are saved back to it.
+            snapshot_max_age (float): The most seconds since a snapshot was saved for it to be restored.
 
         Example Usage:
             .. code-block:: python
@@ -238,6 +498,8 @@ class TikTokApi:
                 with TikTokApi() as api:
                     await api.create_sessions(num_sessions=5, ms_tokens=['msToken1', 'msToken2'])
         """
+        self.session_pool.max_concurrency = max_concurrency_per_session
+        self.transport = transport
         self.playwright = await async_playwright().start()
         if headless and override_browser_args is None:
             override_browser_args = ["--headless=new"]
@@ -246,7 +508,19 @@ class TikTokApi:
             headless=headless, args=override_browser_args, proxy=random_choice(proxies)
         )
 
+        snapshots = []
+        if snapshot_path is not None:
+            snapshots = read_snapshot(snapshot_path, snapshot_max_age)[:num_sessions]
+
         await asyncio.gather(
+            *(
+                self.__create_session(
+                    context_options=context_options,
+                    suppress_resource_load_types=suppress_resource_load_types,
+                    snapshot=snapshot,
+                )
+                for snapshot in snapshots
+            ),
             *(
                 self.__create_session(
                     proxy=random_choice(proxies),
@@ -257,11 +531,43 @@ class TikTokApi:
                     cookies=random_choice(cookies),
                     suppress_resource_load_types=suppress_resource_load_types,
                 )
-                for _ in range(num_sessions)
-            )
+                for _ in range(num_sessions - len(snapshots))
+            ),
         )
         self.num_sessions = len(self.sessions)
 
+        if snapshot_path is not None and len(snapshots) < num_sessions:
+            await self.save_sessions(snapshot_path)
+
+    async def save_sessions(self, path: str):
+        """
+        Save the state of every session to a file so create_sessions can restore them.
+
+        Args:
+            path (str): The file to save the sessions to.
+
+        Example Usage:
+            .. code-block:: python
+
+                await api.save_sessions("sessions.json")
+                # later, in another process
+                await api.create_sessions(num_sessions=5, snapshot_path="sessions.json")
+        """
+        write_snapshot(
+            path,
+            [
+                {
+                    "storage_state": await session.context.storage_state(),
+                    "ms_token": session.ms_token,
+                    "headers": session.headers,
+                    "params": session.params,
+                    "base_url": session.base_url,
+                    "proxy": session.proxy,
+                }
+                for session in self.sessions
+            ],
+        )
+
     async def close_sessions(self):
         """
         Close all the sessions. Should be called when you're done with the TikTokApi object
@@ -291,20 +597,16 @@ class TikTokApi:
         """
 
     def _get_session(self, **kwargs):
-        """Get a random session
+        """Get the least loaded healthy session
 
         Args:
-            session_index (int): The index of the session you want to use, if not provided a random session will be used.
+            session_index (int): The index of the session you want to use, if not provided the least loaded session will be used.
 
         Returns:
             int: The index of the session.
             TikTokPlaywrightSession: The session.
         """
-        if kwargs.get("session_index") is not None:
-            i = kwargs["session_index"]
-        else:
-            i = random.randint(0, self.num_sessions - 1)
-        return i, self.sessions[i]
+        return self.session_pool.select(kwargs.get("session_index"))
 
     async def get_session_cookies(self, session):
         """
@@ -326,32 +628,76 @@ class TikTokApi:
         Args:
             url (str): The url to fetch.
             headers (dict): The headers to use for the fetch.
+            session_index (int): The index of the session you want to use, if not provided the least loaded session will be used.
 
         Returns:
             any: The result of the fetch. Seems to be a string or dict
         """
-        js_script = self.generate_js_fetch("GET", url, headers)
-        _, session = self._get_session(**kwargs)
-        result = await session.page.evaluate(js_script)
-        return result
+        async with self.session_pool.acquire(kwargs.get("session_index")) as (
+            _,
+            session,
+        ):
+            return await self._run_fetch_script(session, url, headers)
+
+    async def _run_fetch_script(
+        self, session: TikTokPlaywrightSession, url: str, headers: dict
+    ):
+        return await session.page.evaluate(_FETCH_JS, [url, headers])
+
+    async def _run_signed_fetch(
+        self,
+        session: TikTokPlaywrightSession,
+        url: str,
+        headers: dict,
+        timings: dict = None,
+    ):
+        """Sign and fetch a url in one round-trip through the page's bridge, adding the seconds spent on each to timings"""
+        if timings is None:
+            return await session.page.evaluate(
+                _SIGNED_FETCH_JS, [url, headers, self.signer_timeout * 1000]
+            )
+
+        body, wait_ms, sign_ms, fetch_ms = await session.page.evaluate(
+            _SIGNED_FETCH_TIMED_JS, [url, headers, self.signer_timeout * 1000]
+        )
+        timings["wait_signer"] = wait_ms / 1000
+        timings["sign"] = sign_ms / 1000
+        timings["fetch"] = fetch_ms / 1000
+        return body
 
     async def generate_x_bogus(self, url: str, **kwargs):
         """Generate the X-Bogus header for a url"""
-        _, session = self._get_session(**kwargs)
+        async with self.session_pool.acquire(kwargs.get("session_index")) as (
+            _,
+            session,
+        ):
+            return await self._generate_x_bogus(session, url)
+
+    async def _wait_for_signer(self, session: TikTokPlaywrightSession):
+        """Wait for TikTok's signing script to load, only checking the page once per session"""
+        if session.signer_ready:
+            return
         await session.page.wait_for_function("window.byted_acrawler !== undefined")
-        result = await session.page.evaluate(
-            f'() => {{ return window.byted_acrawler.frontierSign("{url}") }}'
-        )
+        session.signer_ready = True
+
+    async def _generate_x_bogus(self, session: TikTokPlaywrightSession, url: str):
+        await self._wait_for_signer(session)
+        result = await session.page.evaluate(_SIGN_URL_JS, url)
         return result
 
     async def sign_url(self, url: str, **kwargs):
         """Sign a url"""
-        i, session = self._get_session(**kwargs)
+        async with self.session_pool.acquire(kwargs.get("session_index")) as (
+            _,
+            session,
+        ):
+            return await self._sign_url(session, url)
 
+    async def _sign_url(self, session: TikTokPlaywrightSession, url: str):
         # TODO: Would be nice to generate msToken here
 
         # Add X-Bogus to url
-        x_bogus = (await self.generate_x_bogus(url, session_index=i)).get("X-Bogus")
+        x_bogus = (await self._generate_x_bogus(session, url)).get("X-Bogus")
         if x_bogus is None:
             raise Exception("Failed to generate X-Bogus")
 
@@ -368,20 +714,32 @@ class TikTokApi:
         url: str,
         headers: dict = None,
         params: dict = None,
-        retries: int = 3,
-        exponential_backoff: bool = True,
+        retries: int = None,
+        exponential_backoff: bool = None,
+        retry_policy: RetryPolicy = None,
+        coalesce: bool = None,
         **kwargs,
     ):
         """
         Makes a request to TikTok through a session.
 
+        Concurrent requests for the same url and params (ignoring msToken,
+        X-Bogus and other volatile params) share one request to TikTok, and all
+        get the same response object, unless coalescing is turned off. If the
+        TikTokApi has a response_cache or disk_cache, endpoints they cache are
+        served from them. Every request first goes through the TikTokApi's
+        middleware, see add_middleware.
+
         Args:
             url (str): The url to make the request to.
             headers (dict): The headers to use for the request.
             params (dict): The params to use for the request.
-            retries (int): The amount of times to retry the request if it fails.
-            exponential_backoff (bool): Whether or not to use exponential backoff when retrying the request.
-            session_index (int): The index of the session you want to use, if not provided a random session will be used.
+            retries (int): The most times to try the request, overrides the retry policy's max_attempts.
+            exponential_backoff (bool): Whether or not to use exponential backoff when retrying the request, overrides the retry policy.
+            retry_policy (RetryPolicy): The retry policy to use instead of the TikTokApi's retry_policy.
+            coalesce (bool): Whether to share identical concurrent requests, defaults to the TikTokApi's coalesce_requests. Requests with headers or a session_index are never shared.
+            session_index (int): The index of the session you want to use, if not provided the least loaded session will be used.
+            priority (float): Where the request queues when every session is busy, lower goes first. The models use PRIORITY_INTERACTIVE for info() and PRIORITY_BULK for paginators, see TikTokApi.session_pool.
 
         Returns:
             dict: The json response from TikTok.
@@ -389,9 +747,755 @@ class TikTokApi:
         Raises:
             Exception: If the request fails.
         """
-        i, session = self._get_session(**kwargs)
-        if session.params is not None:
-            params = {**session.params, **params}
+        if self.middleware:
+            options = {
+                "retries": retries,
+                "exponential_backoff": exponential_backoff,
+                "retry_policy": retry_policy,
+                "coalesce": coalesce,
+                **kwargs,
+            }
+            return await self._middleware_handler(
+                Request(url, params, headers, options)
+            )
+        return await self._send_request(
+            url,
+            headers,
+            params,
+            retries,
+            exponential_backoff,
+            retry_policy,
+            coalesce,
+            **kwargs,
+        )
+
+    def add_middleware(self, middleware: Middleware):
+        """
+        Add a middleware to the end of the chain every make_request call goes through.
+
+        Middleware added first sees requests first and responses last.
+
+        Args:
+            middleware (Middleware): An async function taking a Request and the next handler, returning the decoded response.
+
+        Example Usage:
+            .. code-block:: python
+
+                async def only_stats(request, call_next):
+                    response = await call_next(request)
+                    return {"stats": response.get("userInfo", {}).get("stats")}
+
+                api.add_middleware(only_stats)
+        """
+        self.middleware.append(middleware)
+        self._middleware_handler = compose(self.middleware, self._handle_request)
+
+    async def _handle_request(self, request: Request):
+        """The end of the middleware chain"""
+        return await self._send_request(
+            request.url, request.headers, request.params, **request.options
+        )
+
+    async def _send_request(
+        self,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        retries: int = None,
+        exponential_backoff: bool = None,
+        retry_policy: RetryPolicy = None,
+        coalesce: bool = None,
+        **kwargs,
+    ):
+        """Make a request through the response cache and coalescing"""
+
+        def fetch(cache_key=None):
+            return self._make_request(
+                url,
+                headers,
+                params,
+                retries,
+                exponential_backoff,
+                retry_policy,
+                cache_key=cache_key,
+                **kwargs,
+            )
+
+        # Requests with their own headers or session may get a different response
+        if headers is not None or kwargs.get("session_index") is not None:
+            return await fetch()
+
+        key = request_key(url, params)
+        fetch = functools.partial(fetch, cache_key=key)
+        if coalesce is None:
+            coalesce = self.coalesce_requests
+        if coalesce:
+            fetch = functools.partial(self._coalesce, key, fetch)
+        return await self._cached(key, urlparse(url).path, fetch)
+
+    async def _coalesce(self, key: str, fetch):
+        """Share one call of fetch between every concurrent caller with the same key"""
+        task = self._in_flight_requests.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._in_flight_requests[key] = task
+            task.add_done_callback(lambda t: self._request_done(key, t))
+        # Shielded so one caller giving up doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _cached(self, key: str, endpoint: str, fetch):
+        """Serve fetch's result from the response cache if the endpoint is cached"""
+        cache = self.response_cache
+        ttl = cache.ttl_for(endpoint) if cache is not None else None
+        if not ttl:
+            return await fetch()
+
+        hit = cache.get(key)
+        if hit is not None:
+            value, stale = hit
+            if stale and key not in self._revalidating:
+                self._revalidating.add(key)
+                task = asyncio.ensure_future(self._revalidate(key, ttl, fetch))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return value
+
+        value = await fetch()
+        cache.set(key, value, ttl)
+        return value
+
+    async def _negative_cached(self, key: tuple, fetch):
+        """Raise straight away if key is known to be missing or private, otherwise remember if fetch finds it is"""
+        cache = self.negative_cache
+        if cache is None:
+            return await fetch()
+
+        cache.check(key)
+        try:
+            return await fetch()
+        except TikTokException as e:
+            cache.record(key, e)
+            raise
+
+    async def _revalidate(self, key: str, ttl: float, fetch):
+        try:
+            self.response_cache.set(key, await fetch(), ttl)
+        except Exception as e:
+            self.logger.info(f"Failed to refresh stale response {key}: {e}")
+        finally:
+            self._revalidating.discard(key)
+
+    def _request_done(self, key: str, task: asyncio.Task):
+        if self._in_flight_requests.get(key) is task:
+            del self._in_flight_requests[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved in case every caller was cancelled
+
+    async def _make_request(
+        self,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        retries: int = None,
+        exponential_backoff: bool = None,
+        retry_policy: RetryPolicy = None,
+        cache_key: str = None,
+        **kwargs,
+    ):
+        """Make a request, retrying it according to the retry policy and reading through the disk cache if it has a cache_key"""
+        if self.cassette is not None and self.cassette.replaying:
+            body, _ = await self.cassette.replay(request_key(url, params))
+            return await self._decode_response(body)
+
+        disk_ttl = None
+        if self.disk_cache is not None and cache_key is not None:
+            disk_ttl = self.disk_cache.ttl_for(urlparse(url).path)
+        if disk_ttl:
+            body = await self.disk_cache.get(cache_key)
+            if body is not None:
+                try:
+                    return await self._decode_response(body)
+                except Exception as e:
+                    self.logger.info(f"Ignoring unusable cached response: {e}")
+
+        policy = retry_policy if retry_policy is not None else self.retry_policy
+        if retries is not None:
+            policy = dataclasses.replace(policy, max_attempts=retries)
+        if exponential_backoff is not None:
+            policy = dataclasses.replace(
+                policy, exponential_backoff=exponential_backoff
+            )
+        if policy.budget is not None:
+            policy.budget.record_request()
+
+        metrics = self.metrics
+        tracer = self.tracer
+        rate_limiter = self.rate_limiter
+        breakers = self.circuit_breakers
+        endpoint = urlparse(url).path
+        if metrics is not None:
+            metrics.increment("requests", endpoint=endpoint)
+            request_started_at = time.perf_counter()
+        if tracer is not None:
+            request_span = tracer.start("request", endpoint=endpoint)
+
+        session_index = kwargs.get("session_index")
+        priority = kwargs.get("priority", PRIORITY_DEFAULT)
+        hedging = self.hedging
+        hedged = (
+            hedging is not None and session_index is None and hedging.covers(endpoint)
+        )
+        if hedged:
+            hedging.budget.record_request()
+        failed_sessions = []
+        attempt = 0
+        while True:
+            attempt += 1
+            current = _Attempt(
+                timings={} if metrics is not None or tracer is not None else None
+            )
+            if breakers is not None:
+                try:
+                    breakers.check(endpoint)
+                except CircuitOpenException as e:
+                    if metrics is not None:
+                        metrics.increment("circuit_open", endpoint=endpoint)
+                    if tracer is not None:
+                        request_span.args["error"] = type(e).__name__
+                        tracer.finish(request_span)
+                    raise
+            try:
+                if hedged and session_index is None:
+                    current, data = await self._hedged_attempt(
+                        current,
+                        url,
+                        headers,
+                        params,
+                        endpoint,
+                        failed_sessions,
+                        priority,
+                        timeout=policy.attempt_timeout,
+                    )
+                else:
+                    data = await self._attempt(
+                        current,
+                        url,
+                        headers,
+                        params,
+                        endpoint,
+                        session_index,
+                        failed_sessions,
+                        priority,
+                        timeout=policy.attempt_timeout,
+                    )
+            except Exception as e:
+                i = current.session_index
+                kind = classify_failure(e)
+                if rate_limiter is not None:
+                    rate_limiter.record(endpoint, i, kind)
+                if breakers is not None:
+                    breakers.record(endpoint, kind)
+                if tracer is not None:
+                    self._trace_attempt(request_span, current, e)
+                if metrics is not None:
+                    metrics.increment(
+                        "failures",
+                        endpoint=endpoint,
+                        session=i,
+                        kind=kind or type(e).__name__,
+                    )
+                if not policy.should_retry(kind, attempt):
+                    if self.cassette is not None and current.body is not None:
+                        # Replaying the body raises the same exception again
+                        self.cassette.record(
+                            request_key(url, params), current.body, current.elapsed
+                        )
+                    if kind is not None:
+                        self.logger.error(
+                            f"Request failed with {kind} after {attempt} attempt(s): {e}"
+                        )
+                    if tracer is not None:
+                        request_span.args["error"] = type(e).__name__
+                        tracer.finish(request_span)
+                    raise
+
+                self.logger.info(
+                    f"Request failed with {kind}, retrying ({attempt}/{policy.max_attempts})"
+                )
+                if metrics is not None:
+                    metrics.increment("retries", endpoint=endpoint)
+                if i is not None:
+                    if policy.switch_session:
+                        failed_sessions.append(i)
+                    elif session_index is None:
+                        session_index = i
+                backoff_started_at = time.perf_counter()
+                await asyncio.sleep(policy.delay(attempt))
+                if tracer is not None:
+                    tracer.add(
+                        "backoff",
+                        backoff_started_at,
+                        time.perf_counter(),
+                        parent=request_span,
+                    )
+                continue
+
+            i = current.session_index
+            if rate_limiter is not None:
+                rate_limiter.record(endpoint, i, None)
+            if breakers is not None:
+                breakers.record(endpoint, None)
+            if tracer is not None:
+                self._trace_attempt(request_span, current)
+                tracer.finish(request_span)
+            if metrics is not None:
+                for stage, seconds in current.timings.items():
+                    metrics.observe(stage, seconds, endpoint=endpoint, session=i)
+                metrics.observe(
+                    "request",
+                    time.perf_counter() - request_started_at,
+                    endpoint=endpoint,
+                )
+            if self.cassette is not None:
+                self.cassette.record(
+                    request_key(url, params), current.body, current.elapsed
+                )
+            if disk_ttl:
+                await self.disk_cache.set(cache_key, current.body, disk_ttl)
+            return data
+
+    async def _attempt(
+        self,
+        attempt: "_Attempt",
+        url: str,
+        headers: dict,
+        params: dict,
+        endpoint: str,
+        session_index: int = None,
+        exclude=(),
+        priority: float = PRIORITY_DEFAULT,
+        strict: bool = False,
+        timeout: float = None,
+    ):
+        """Send a request once on a session, keeping what happened in attempt even if it raises, signing and fetching raise asyncio.TimeoutError after timeout seconds"""
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            await rate_limiter.wait_for_endpoint(endpoint)
+        # An empty AsyncExitStack holds nothing when concurrency is unlimited
+        slot = (
+            self.concurrency.slot(priority)
+            if self.concurrency is not None
+            else contextlib.AsyncExitStack()
+        )
+        acquire = self.session_pool.acquire(
+            session_index, exclude=exclude, priority=priority, strict=strict
+        )
+        async with slot as start_latency, acquire as (i, session):
+            attempt.session_index = i
+            attempt.acquired_at = time.perf_counter()
+            attempt.acquired.set()
+            if rate_limiter is not None:
+                await rate_limiter.wait_for_session(i)
+            if self.concurrency is not None:
+                # Waiting for the session and rate limiter isn't TikTok's latency
+                start_latency()
+            started_at = time.monotonic()
+            attempt.body = await asyncio.wait_for(
+                self._fetch_on_session(
+                    session,
+                    url,
+                    headers=headers,
+                    params=params,
+                    timings=attempt.timings,
+                ),
+                timeout,
+            )
+            attempt.elapsed = time.monotonic() - started_at
+            decode_started_at = time.perf_counter()
+            data = await self._decode_response(attempt.body)
+            if attempt.timings is not None:
+                attempt.timings["decode"] = time.perf_counter() - decode_started_at
+            return data
+
+    async def _hedged_attempt(
+        self,
+        primary: "_Attempt",
+        url: str,
+        headers: dict,
+        params: dict,
+        endpoint: str,
+        exclude: list,
+        priority: float = PRIORITY_DEFAULT,
+        timeout: float = None,
+    ) -> tuple:
+        """
+        Send a request once, and again on another session if it's slower than the hedge delay.
+
+        Returns:
+            _Attempt: The attempt that responded first.
+            Any: Its decoded response.
+
+        Raises:
+            Exception: The primary attempt's exception if every attempt failed.
+        """
+        hedging = self.hedging
+        attempts = {
+            asyncio.ensure_future(
+                self._attempt(
+                    primary,
+                    url,
+                    headers,
+                    params,
+                    endpoint,
+                    exclude=exclude,
+                    priority=priority,
+                    timeout=timeout,
+                )
+            ): primary
+        }
+        delay = hedging.delay(endpoint) if len(self.sessions) > 1 else None
+        pending = set(attempts)
+        acquired = asyncio.ensure_future(primary.acquired.wait())
+        try:
+            if delay is not None:
+                # Only hedge attempts stuck on a session, not ones queued for a slot
+                await asyncio.wait(
+                    {acquired, *pending}, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending = {t for t in pending if not t.done()}
+            if pending and delay is not None:
+                remaining = delay - (time.perf_counter() - primary.acquired_at)
+                if remaining > 0:
+                    pending = (await asyncio.wait(pending, timeout=remaining))[1]
+                hedge_exclude = [*exclude, primary.session_index]
+                # A hedge only helps on another session, so skip it if none is free
+                if (
+                    pending
+                    and self.session_pool.has_free_slot(hedge_exclude)
+                    and hedging.budget.try_spend()
+                ):
+                    hedging.hedges += 1
+                    if self.metrics is not None:
+                        self.metrics.increment("hedges", endpoint=endpoint)
+                    hedge = _Attempt(
+                        timings={} if primary.timings is not None else None
+                    )
+                    task = asyncio.ensure_future(
+                        self._attempt(
+                            hedge,
+                            url,
+                            headers,
+                            params,
+                            endpoint,
+                            exclude=hedge_exclude,
+                            priority=priority,
+                            strict=True,
+                            timeout=timeout,
+                        )
+                    )
+                    attempts[task] = hedge
+                    pending.add(task)
+
+            for task in attempts:
+                if task.done() and task.exception() is None:
+                    break
+            else:
+                task = None
+            while task is None and pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                task = next((t for t in done if t.exception() is None), None)
+
+            if task is None:
+                raise next(iter(attempts)).exception()
+            attempt = attempts[task]
+            if attempt is not primary:
+                hedging.wins += 1
+            hedging.record(endpoint, time.perf_counter() - attempt.acquired_at)
+            return attempt, task.result()
+        finally:
+            acquired.cancel()
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            for task in attempts:
+                # Retrieve the loser's exception so asyncio doesn't log it
+                if not task.cancelled():
+                    task.exception()
+
+    def _trace_attempt(
+        self,
+        request_span: Span,
+        attempt: "_Attempt",
+        error: Exception = None,
+    ):
+        """Record the spans of an attempt, laying its stages out back to back up to now"""
+        session_index = attempt.session_index
+        started_at = attempt.started_at
+        acquired_at = attempt.acquired_at
+        timings = attempt.timings
+        tracer = self.tracer
+        now = time.perf_counter()
+        tracer.add(
+            "acquire",
+            started_at,
+            acquired_at if acquired_at is not None else now,
+            parent=request_span,
+        )
+        if acquired_at is None:
+            return
+
+        args = {"error": type(error).__name__} if error is not None else {}
+        attempt = tracer.start(
+            "attempt", parent=request_span, session=session_index, **args
+        )
+        attempt.start = acquired_at
+        end = now
+        for stage in ("decode", "fetch", "sign", "wait_signer"):
+            if stage in timings:
+                start = max(acquired_at, end - timings[stage])
+                tracer.add(stage, start, end, parent=attempt, session=session_index)
+                end = start
+        tracer.finish(attempt, now)
+
+    async def _fetch_on_session(
+        self,
+        session: TikTokPlaywrightSession,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        timings: dict = None,
+    ) -> str:
+        """Sign and fetch a request on an already selected session, returning the body and adding the seconds spent signing and fetching to timings"""
+        encoded_params, headers = await self._prepare_request(
+            session, url, headers, params
+        )
+        if session.bridge_installed and self.transport is None:
+            result = await self._run_signed_fetch(
+                session, encoded_params, headers, timings
+            )
+        else:
+            started_at = time.perf_counter()
+            await self._wait_for_signer(session)
+            if timings is not None:
+                timings["wait_signer"] = time.perf_counter() - started_at
+                started_at = time.perf_counter()
+            signed_url = await self._sign_url(session, encoded_params)
+            if timings is not None:
+                timings["sign"] = time.perf_counter() - started_at
+                started_at = time.perf_counter()
+            if self.transport is not None:
+                result = await self.transport.fetch(session, signed_url, headers)
+            else:
+                result = await self._run_fetch_script(session, signed_url, headers)
+            if timings is not None:
+                timings["fetch"] = time.perf_counter() - started_at
+
+        return result
+
+    async def make_requests(
+        self, batch: list[dict], return_exceptions: bool = False, **kwargs
+    ) -> list:
+        """
+        Makes several requests to TikTok at once.
+
+        All the urls are signed and fetched concurrently in a single round-trip
+        to the browser, or two for sessions without the signing bridge, instead
+        of at least one round-trip per request. Failed requests aren't retried.
+        Each request holds one of the session's slots, so when the sessions
+        have a max_concurrency larger batches are split into chunks of that
+        size, which can run on different sessions.
+        Every request in the batch takes its own tokens from the rate limiter,
+        and its outcome is fed back to it and the circuit breakers like
+        make_request's.
+
+        Args:
+            batch (list[dict]): The requests to make, each a dict with a url key and optionally the params and headers keys make_request takes.
+            return_exceptions (bool): Whether to return the exception in place of a failed response instead of raising the first one.
+            session_index (int): The index of the session you want to use, if not provided the least loaded session will be used.
+
+        Returns:
+            list: The json responses from TikTok, in the same order as batch.
+
+        Raises:
+            CircuitOpenException: If the circuit breaker of an endpoint in the batch is open, nothing is sent then.
+            Exception: If a request fails and return_exceptions is False.
+
+        Example Usage:
+            .. code-block:: python
+
+                responses = await api.make_requests([
+                    {"url": "https://www.tiktok.com/api/user/detail/", "params": {"uniqueId": "therock"}},
+                    {"url": "https://www.tiktok.com/api/user/detail/", "params": {"uniqueId": "tiktok"}},
+                ])
+        """
+        if len(batch) == 0:
+            return []
+
+        keys = [request_key(r["url"], r.get("params")) for r in batch]
+        endpoints = [urlparse(r["url"]).path for r in batch]
+        rate_limiter = self.rate_limiter
+        breakers = self.circuit_breakers
+        replaying = self.cassette is not None and self.cassette.replaying
+        if replaying:
+            results = [await self.cassette.replay_fetch(key) for key in keys]
+        else:
+            if breakers is not None:
+                for endpoint in dict.fromkeys(endpoints):
+                    try:
+                        breakers.check(endpoint)
+                    except CircuitOpenException:
+                        if self.metrics is not None:
+                            self.metrics.increment("circuit_open", endpoint=endpoint)
+                        raise
+            if rate_limiter is not None:
+                await asyncio.gather(
+                    *(rate_limiter.wait_for_endpoint(e) for e in endpoints)
+                )
+            # Each request of a batch holds a slot, so split batches the
+            # sessions' max_concurrency can't fit into chunks that can
+            size = self.session_pool.max_concurrency or len(batch)
+            chunks = [batch[j : j + size] for j in range(0, len(batch), size)]
+            started_at = time.monotonic()
+            fetched = await asyncio.gather(
+                *(
+                    self._fetch_many(chunk, kwargs.get("session_index"))
+                    for chunk in chunks
+                )
+            )
+            results = []
+            sessions = []
+            for i, chunk_results in fetched:
+                results.extend(chunk_results)
+                sessions.extend([i] * len(chunk_results))
+
+            if self.cassette is not None:
+                elapsed = time.monotonic() - started_at
+                for key, (body, error) in zip(keys, results):
+                    self.cassette.record(key, body, elapsed, error=error)
+
+        responses = []
+        for body, error in results:
+            try:
+                if error is not None:
+                    raise ConnectionError(f"Failed to fetch: {error}")
+                responses.append(await self._decode_response(body))
+            except Exception as e:
+                responses.append(e)
+
+        if not replaying:
+            for endpoint, i, response in zip(endpoints, sessions, responses):
+                kind = (
+                    classify_failure(response)
+                    if isinstance(response, Exception)
+                    else None
+                )
+                if rate_limiter is not None:
+                    rate_limiter.record(endpoint, i, kind)
+                if breakers is not None:
+                    breakers.record(endpoint, kind)
+
+        if not return_exceptions:
+            for response in responses:
+                if isinstance(response, Exception):
+                    raise response
+        return responses
+
+    async def _fetch_many(self, batch: list[dict], session_index: int = None) -> tuple:
+        """
+        Sign and fetch requests concurrently on one session, holding a slot of it for each request.
+
+        Returns:
+            int: The index of the session.
+            list: The [body, error] of each request, in the same order as batch.
+        """
+        rate_limiter = self.rate_limiter
+        async with self.session_pool.acquire(session_index, weight=len(batch)) as (
+            i,
+            session,
+        ):
+            if rate_limiter is not None:
+                await asyncio.gather(*(rate_limiter.wait_for_session(i) for _ in batch))
+            prepared = [
+                await self._prepare_request(
+                    session, r["url"], r.get("headers"), r.get("params")
+                )
+                for r in batch
+            ]
+
+            if session.bridge_installed and self.transport is None:
+                results = await session.page.evaluate(
+                    _SIGNED_FETCH_MANY_JS,
+                    [[list(p) for p in prepared], self.signer_timeout * 1000],
+                )
+            else:
+                await self._wait_for_signer(session)
+                x_bogus_values = await session.page.evaluate(
+                    _SIGN_URLS_JS, [url for url, _ in prepared]
+                )
+                signed = []
+                for (url, headers), x_bogus in zip(prepared, x_bogus_values):
+                    if x_bogus is None:
+                        raise Exception("Failed to generate X-Bogus")
+                    separator = "&" if "?" in url else "?"
+                    signed.append([f"{url}{separator}X-Bogus={x_bogus}", headers])
+
+                if self.transport is not None:
+                    results = await asyncio.gather(
+                        *(self._transport_fetch(session, *r) for r in signed)
+                    )
+                else:
+                    results = await session.page.evaluate(_FETCH_URLS_JS, signed)
+        return i, results
+
+    async def _transport_fetch(
+        self, session: TikTokPlaywrightSession, url: str, headers: dict
+    ) -> list:
+        """Fetch with the transport, returning [body, error] like the batch fetch script"""
+        try:
+            return [await self.transport.fetch(session, url, headers), None]
+        except Exception as e:
+            return [None, str(e)]
+
+    async def _decode_response(self, result: str) -> dict:
+        """Decode the body of a fetch, raising if TikTok didn't send valid json"""
+        if result is None:
+            raise Exception("TikTokApi.run_fetch_script returned None")
+
+        if result == "":
+            raise EmptyResponseException(result, "TikTok returned an empty response")
+
+        try:
+            data = await self.json_codec.decode(result)
+        except ValueError:
+            raise InvalidJSONException(result, "TikTok returned invalid JSON")
+
+        status_code = data.get("status_code", data.get("statusCode"))
+        if status_code not in (None, 0):
+            raise status_code_exception(status_code)(
+                data,
+                f"TikTok returned status_code {status_code}: {data.get('status_msg')}",
+                error_code=status_code,
+            )
+        return data
+
+    async def _prepare_request(
+        self,
+        session: TikTokPlaywrightSession,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+    ) -> tuple[str, dict]:
+        """Merge in the session's params and headers, returning the encoded url and headers"""
+        params = params if params is not None else {}
+        ms_token = params.get("msToken")
+        # Only the params this endpoint adds are encoded per request, the
+        # session's static params come pre-encoded from the session
+        endpoint_params = {k: v for k, v in params.items() if k != "msToken"}
+        session_params = session.params if session.params is not None else {}
+        overridden = frozenset(k for k in endpoint_params if k in session_params)
 
         if headers is not None:
             headers = {**session.headers, **headers}
@@ -399,10 +1503,10 @@ class TikTokApi:
             headers = session.headers
 
         # get msToken
-        if params.get("msToken") is None:
+        if ms_token is None:
             # try to get msToken from session
             if session.ms_token is not None:
-                params["msToken"] = session.ms_token
+                ms_token = session.ms_token
             else:
                 # we'll try to read it from cookies
                 cookies = await self.get_session_cookies(session)
@@ -411,41 +1515,17 @@ class TikTokApi:
                     self.logger.warn(
                         "Failed to get msToken from cookies, trying to make the request anyway (probably will fail)"
                     )
-                params["msToken"] = ms_token
-
-        encoded_params = f"{url}?{urlencode(params, quote_via=quote)}"
-        signed_url = await self.sign_url(encoded_params, session_index=i)
 
-        retry_count = 0
-        while i < retries:
-            retry_count += 1
-            result = await self.run_fetch_script(
-                signed_url, headers=headers, session_index=i
+        query = "&".join(
+            q
+            for q in (
+                session.encoded_params(overridden),
+                urlencode(endpoint_params, quote_via=quote),
+                urlencode({"msToken": ms_token}, quote_via=quote),
             )
-
-            if result is None:
-                raise Exception("TikTokApi.run_fetch_script returned None")
-
-            if result == "":
-                raise EmptyResponseException(result, "TikTok returned an empty response")
-
-            try:
-                data = json.loads(result)
-                if data.get("status_code") != 0:
-                    self.logger.error(f"Got an unexpected status code: {data}")
-                return data
-            except json.decoder.JSONDecodeError:
-                if retry_count == retries:
-                    self.logger.error(f"Failed to decode json response: {result}")
-                    raise InvalidJSONException()
-
-                self.logger.info(
-                    f"Failed a request, retrying ({retry_count}/{retries})"
-                )
-                if exponential_backoff:
-                    await asyncio.sleep(2**retry_count)
-                else:
-                    await asyncio.sleep(1)
+            if q
+        )
+        return f"{url}?{query}", headers
 
     async def close_sessions(self):
         """Close all the sessions. Should be called when you're done with the TikTokApi object"""
@@ -454,10 +1534,17 @@ class TikTokApi:
             await session.context.close()
         self.sessions.clear()
 
+        if self.transport is not None:
+            await self.transport.close()
+
     async def stop_playwright(self):
-        """Stop the playwright browser"""
-        await self.browser.close()
-        await self.playwright.stop()
+        """Stop the playwright browser, if create_sessions started it"""
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
 
     async def get_session_content(self, url: str, **kwargs):
         """Get the content of a url"""
@@ -470,3 +1557,9 @@ class TikTokApi:
     async def __aexit__(self, exc_type, exc, tb):
         await self.close_sessions()
         await self.stop_playwright()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+        await self.identifier_cache.flush()
+        self.identifier_cache.close()
+        if self.cassette is not None:
+            self.cassette.close()
@@ -0,0 +1,254 @@
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import os
+import time
+from typing import Any, ClassVar, Optional
+
+_current_span = contextvars.ContextVar("tiktokapi_current_span", default=None)
+
+# Chrome trace processes, one track per paginator call and one per session
+_TASKS_PID = 1
+_SESSIONS_PID = 2
+
+
+class Span:
+    """A timed operation, nested under the span that was current when it started"""
+
+    __slots__ = ("id", "name", "start", "end", "parent", "track", "session", "args")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        start: float,
+        parent: Optional["Span"],
+        session: Optional[int],
+        args: dict,
+    ):
+        self.id = id
+        self.name = name
+        self.start = start
+        self.end = None
+        self.parent = parent
+        self.track = parent.track if parent is not None else id
+        self.session = session
+        self.args = args
+
+
+class Tracer:
+    """
+    Records spans of each request's lifecycle for viewing as a timeline.
+
+    Every make_request call gets a request span with acquire, attempt,
+    wait_signer, sign, fetch, decode and backoff spans under it. Requests made
+    by a paginator such as User.videos nest under its span, along with a
+    yield span for each time the consumer holds an item. Spans export to the
+    Chrome trace-event format, viewable in chrome://tracing or Perfetto, with
+    a track per paginator call and a track per session.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.tracing import Tracer
+
+            api = TikTokApi(tracer=Tracer())
+            ...
+            api.tracer.export("trace.json")
+    """
+
+    active: ClassVar[Optional["Tracer"]] = None
+    """The tracer of the latest TikTokApi, used by the traced paginators."""
+
+    def __init__(self, max_spans: Optional[int] = 1_000_000):
+        """
+        Args:
+            max_spans (int): The most spans to keep, later ones are dropped. Unlimited if None.
+        """
+        self.max_spans = max_spans
+        self.spans = []
+        self.dropped = 0
+        self._ids = itertools.count(1)
+        self._origin = time.perf_counter()
+
+    def start(
+        self, name: str, parent: Any = ..., session: Optional[int] = None, **args
+    ) -> Span:
+        """
+        Start a span, call finish when it's done.
+
+        Args:
+            name (str): What the span times.
+            parent (Span): The span to nest under, the current span if not given.
+            session (int): The index of the session the span holds, if any.
+        """
+        if parent is ...:
+            parent = _current_span.get()
+        return Span(next(self._ids), name, time.perf_counter(), parent, session, args)
+
+    def finish(self, span: Span, end: Optional[float] = None):
+        """Record a started span as ending at end, or now"""
+        span.end = end if end is not None else time.perf_counter()
+        if self.max_spans is not None and len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return
+        self.spans.append(span)
+
+    def add(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        parent: Any = ...,
+        session: Optional[int] = None,
+        **args,
+    ) -> Span:
+        """Record a span that already happened, start and end are from time.perf_counter"""
+        span = self.start(name, parent, session, **args)
+        span.start = start
+        self.finish(span, end)
+        return span
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args):
+        """Time a block as a span, which is the current span within the block"""
+        span = self.start(name, **args)
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+            self.finish(span)
+
+    def chrome_trace(self) -> dict:
+        """
+        Returns the spans as a Chrome trace.
+
+        Returns:
+            dict: A trace in the Chrome trace-event JSON format.
+        """
+
+        def us(t: float) -> float:
+            return round((t - self._origin) * 1_000_000, 3)
+
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": _TASKS_PID,
+                "args": {"name": "Requests"},
+            },
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": _SESSIONS_PID,
+                "args": {"name": "Sessions"},
+            },
+        ]
+        tracks = {}
+        sessions = set()
+        for span in self.spans:
+            if span.track not in tracks:
+                root = span
+                while root.parent is not None:
+                    root = root.parent
+                tracks[span.track] = root.name
+            event = {
+                "name": span.name,
+                "cat": "tiktokapi",
+                "ph": "X",
+                "ts": us(span.start),
+                "dur": us(span.end) - us(span.start),
+                "pid": _TASKS_PID,
+                "tid": span.track,
+                "args": {
+                    **{k: str(v) for k, v in span.args.items()},
+                    "span_id": span.id,
+                },
+            }
+            if span.parent is not None:
+                event["args"]["parent_id"] = span.parent.id
+            events.append(event)
+
+            if span.session is not None and span.name == "attempt":
+                sessions.add(span.session)
+                events.append({**event, "pid": _SESSIONS_PID, "tid": span.session})
+
+        for track, name in tracks.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": _TASKS_PID,
+                    "tid": track,
+                    "args": {"name": f"{name} #{track}"},
+                }
+            )
+        for session in sorted(sessions):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": _SESSIONS_PID,
+                    "tid": session,
+                    "args": {"name": f"session {session}"},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str):
+        """Write the spans to path as a Chrome trace"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """Forget every span"""
+        self.spans.clear()
+        self.dropped = 0
+
+
+def traced(name: str):
+    """
+    Trace an async generator method as a span, with a yield span for each item it yields.
+
+    Requests the generator makes nest under its span, and nothing is recorded
+    unless the TikTokApi has a tracer.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            tracer = Tracer.active
+            if tracer is None:
+                async for item in func(*args, **kwargs):
+                    yield item
+                return
+
+            parent = _current_span.get()
+            span = tracer.start(name, parent)
+            items = func(*args, **kwargs)
+            try:
+                while True:
+                    # Only the generator runs under the span, not the consumer
+                    _current_span.set(span)
+                    try:
+                        item = await items.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        _current_span.set(parent)
+
+                    yielded_at = time.perf_counter()
+                    yield item
+                    tracer.add("yield", yielded_at, time.perf_counter(), parent=span)
+            finally:
+                await items.aclose()
+                tracer.finish(span)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,148 @@
+import time
+from typing import Any, Optional
+from urllib.parse import quote, urlparse
+
+# Headers the client manages itself, sending the browser's copy would be wrong
+_SKIPPED_HEADERS = {"host", "content-length", "connection", "cookie"}
+
+
+class HTTPTransport:
+    """
+    Sends signed requests with a pooled async HTTP client instead of the browser's fetch.
+
+    The browser is still used to sign urls and to hold the msToken and cookies,
+    but response bodies no longer have to be serialized through Playwright.
+    Each session gets its own keep-alive client which shares the session's
+    cookies, headers and proxy.
+
+    Requires httpx, installed with ``pip install TikTokApi[http]``.
+
+    Example Usage:
+        .. code-block:: python
+
+            from TikTokApi.transport import HTTPTransport
+
+            async with TikTokApi() as api:
+                await api.create_sessions(ms_tokens=[ms_token], transport=HTTPTransport(http2=True))
+    """
+
+    def __init__(
+        self,
+        http2: bool = False,
+        max_connections: int = 100,
+        timeout: float = 30.0,
+        cookie_refresh_interval: float = 60.0,
+    ):
+        """
+        Args:
+            http2 (bool): Whether to use HTTP/2, needs the h2 package.
+            max_connections (int): The most open connections a single session's client keeps.
+            timeout (float): The seconds to wait for a response.
+            cookie_refresh_interval (float): How often, in seconds, to copy the browser's cookies into the client.
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "HTTPTransport requires httpx, install it with: pip install TikTokApi[http]"
+            )
+
+        self._httpx = httpx
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cookie_refresh_interval = cookie_refresh_interval
+        self._clients = {}
+
+    def _create_client(self, session: Any):
+        return self._httpx.AsyncClient(
+            http2=self.http2,
+            proxy=_proxy_url(session.proxy),
+            timeout=self.timeout,
+            limits=self._httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+    async def _client_for(self, session: Any):
+        entry = self._clients.get(id(session))
+        if entry is None:
+            entry = [self._create_client(session), None]
+            self._clients[id(session)] = entry
+
+        client, synced_at = entry
+        now = time.monotonic()
+        if synced_at is None or now - synced_at >= self.cookie_refresh_interval:
+            for cookie in await session.context.cookies():
+                client.cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain", ""),
+                    path=cookie.get("path", "/"),
+                )
+            entry[1] = now
+        return client
+
+    async def fetch(self, session: Any, url: str, headers: Optional[dict]) -> str:
+        """
+        GET a signed url with a session's cookies.
+
+        Args:
+            session (TikTokPlaywrightSession): The session whose cookies and proxy to use.
+            url (str): The signed url.
+            headers (dict): The headers to send.
+
+        Returns:
+            str: The body of the response, whatever its status code.
+
+        Raises:
+            TimeoutError: If TikTok doesn't respond in time.
+            ConnectionError: If the request couldn't be sent.
+        """
+        client = await self._client_for(session)
+        headers = {
+            k: v
+            for k, v in (headers or {}).items()
+            if k.lower() not in _SKIPPED_HEADERS
+        }
+        try:
+            response = await client.get(url, headers=headers)
+        except self._httpx.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise ConnectionError(str(e)) from e
+        return response.text
+
+    async def close_session(self, session: Any):
+        """Close the client belonging to a session"""
+        entry = self._clients.pop(id(session), None)
+        if entry is not None:
+            await entry[0].aclose()
+
+    async def close(self):
+        """Close every client"""
+        for client, _ in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+def _proxy_url(proxy: Any) -> Optional[str]:
+    """Convert a Playwright proxy setting into a proxy url"""
+    if proxy is None or isinstance(proxy, str):
+        return proxy
+
+    server = proxy.get("server")
+    if server is None:
+        return None
+    if "://" not in server:
+        server = f"http://{server}"
+    username = proxy.get("username")
+    if username is None:
+        return server
+
+    parsed = urlparse(server)
+    auth = quote(username, safe="")
+    if proxy.get("password") is not None:
+        auth += ":" + quote(proxy["password"], safe="")
+    return f"{parsed.scheme}://{auth}@{parsed.netloc}{parsed.path}"
@@ -0,0 +1,398 @@
+"""
+A local stand-in for TikTok's web API, for benchmarking TikTokApi offline.
+
+It serves the endpoints TikTokApi paginates with realistic payloads and
+cursors, a page with a fake ``byted_acrawler`` signer to create sessions on,
+and video pages for Video.info. Responses are delayed by a lognormal latency
+model and a fraction of them can be turned into errors.
+
+Example Usage:
+    .. code-block:: python
+
+        from benchmarks.mock_server import LatencyModel, MockTikTokServer
+
+        with MockTikTokServer(latency=LatencyModel(median=0.05), error_rate=0.01) as server:
+            print(server.url)
+"""
+
+import dataclasses
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+EMPTY = "empty"
+STATUS_CODE = "status_code"
+SERVER_ERROR = "server_error"
+SLOW = "slow"
+
+# The page sessions are created on, it signs urls like TikTok's own script
+_ROOT_HTML = """<!DOCTYPE html>
+<html>
+<head><title>Mock TikTok</title></head>
+<body>
+<script>
+window.byted_acrawler = {
+    frontierSign: (url) => ({ "X-Bogus": "DFSzswVLmockmockmockmock" }),
+};
+document.cookie = "msToken=mock-ms-token; path=/";
+</script>
+</body>
+</html>
+"""
+
+_VIDEO_HTML = """<!DOCTYPE html>
+<html>
+<head><title>Mock TikTok video</title></head>
+<body>
+<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">{data}</script>
+</body>
+</html>
+"""
+
+
+@dataclasses.dataclass
+class LatencyModel:
+    """Lognormal response times, most responses take about median seconds and a few take much longer"""
+
+    median: float = 0.08
+    """The median seconds to respond."""
+    sigma: float = 0.5
+    """The spread of the distribution, the p99 is about median * e ** (2.33 * sigma)."""
+    max: float = 5.0
+    """The most seconds to ever wait."""
+
+    def sample(self, rng: random.Random) -> float:
+        return min(self.max, self.median * math.exp(self.sigma * rng.gauss(0, 1)))
+
+
+def _number(seed: str, digits: int = 19) -> str:
+    """A stable numeric ID derived from seed"""
+    value = int(hashlib.blake2b(seed.encode(), digest_size=8).hexdigest(), 16)
+    return str(value % 10**digits).rjust(digits, "7")
+
+
+def _user(name: str) -> dict:
+    return {
+        "id": _number(f"user:{name}"),
+        "secUid": f"MS4wLjABAAAA{_number(f'sec:{name}', 32)}",
+        "uniqueId": name,
+        "nickname": name.title(),
+        "signature": "Just a mock user",
+        "verified": False,
+        "privateAccount": False,
+    }
+
+
+def _video(seed: str, index: int, author: Optional[str] = None) -> dict:
+    video_id = _number(f"video:{seed}:{index}")
+    author = author or f"creator{int(video_id) % 997}"
+    music_id = _number(f"music:{int(video_id) % 113}")
+    return {
+        "id": video_id,
+        "desc": f"Mock video {index} #mock #benchmark",
+        "createTime": 1_700_000_000 + index,
+        "author": _user(author),
+        "music": {
+            "id": music_id,
+            "title": f"original sound - {author}",
+            "playUrl": f"https://example.com/music/{music_id}.mp3",
+            "coverLarge": f"https://example.com/music/{music_id}.jpg",
+            "authorName": author,
+            "original": True,
+            "duration": 15,
+        },
+        "challenges": [
+            {"id": _number("challenge:mock"), "title": "mock"},
+            {"id": _number("challenge:benchmark"), "title": "benchmark"},
+        ],
+        "stats": {
+            "diggCount": index * 31,
+            "shareCount": index * 3,
+            "commentCount": index * 7,
+            "playCount": index * 1013,
+        },
+        "video": {
+            "id": video_id,
+            "height": 1024,
+            "width": 576,
+            "duration": 15,
+            "cover": f"https://example.com/video/{video_id}.jpg",
+            "playAddr": f"https://example.com/video/{video_id}.mp4",
+        },
+    }
+
+
+def _comment(seed: str, index: int) -> dict:
+    user = _user(f"commenter{index % 101}")
+    return {
+        "cid": _number(f"comment:{seed}:{index}"),
+        "text": f"Mock comment {index}",
+        "digg_count": index,
+        "create_time": 1_700_000_000 + index,
+        "user": {
+            "uid": user["id"],
+            "unique_id": user["uniqueId"],
+            "sec_uid": user["secUid"],
+            "nickname": user["nickname"],
+        },
+    }
+
+
+class MockTikTokServer:
+    """
+    Serves TikTok's web API from a background thread.
+
+    Every list endpoint has items_per_object items per user, hashtag, sound,
+    video or search term, after which hasMore is false. The recommended feed
+    never runs out.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[LatencyModel] = None,
+        error_rate: float = 0.0,
+        error_kinds: tuple = (EMPTY, STATUS_CODE, SERVER_ERROR),
+        items_per_object: int = 300,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, any free port if 0.
+            latency (LatencyModel): How long responses take, LatencyModel() if None.
+            error_rate (float): The fraction of API responses to turn into errors.
+            error_kinds (tuple): The kinds of error to inject, picked at random.
+            items_per_object (int): The number of videos, comments or users each list endpoint has per object.
+            seed (int): Seeds the latency and error randomness, for reproducible runs.
+        """
+        self.latency = latency if latency is not None else LatencyModel()
+        self.error_rate = error_rate
+        self.error_kinds = error_kinds
+        self.items_per_object = items_per_object
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        server = self
+
+        class Handler(_Handler):
+            mock = server
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """The base url of the server"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _draw(self) -> tuple[float, Optional[str]]:
+        """The delay and the injected error, if any, for the next response"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency.sample(self._rng)
+            error = None
+            if self.error_kinds and self._rng.random() < self.error_rate:
+                error = self._rng.choice(self.error_kinds)
+                self.errors += 1
+        if error == SLOW:
+            delay = self.latency.max
+        return delay, error
+
+    def _page(self, total: Optional[int], cursor: int, count: int) -> tuple:
+        """The item indices of a page, whether there's more and the next cursor"""
+        end = cursor + count if total is None else min(cursor + count, total)
+        has_more = total is None or end < total
+        return range(cursor, end), has_more, end
+
+    def respond(self, path: str, query: dict) -> Optional[dict]:
+        """The JSON body for an API path, None if the path isn't served"""
+        q = {k: v[0] for k, v in query.items()}
+        cursor = int(q.get("cursor", 0) or 0)
+        count = int(q.get("count", 30) or 30)
+        total = self.items_per_object
+
+        if path == "/api/user/detail/":
+            name = q.get("uniqueId") or "mockuser"
+            return {"statusCode": 0, "userInfo": {"user": _user(name), "stats": {}}}
+        if path == "/api/challenge/detail/":
+            name = q.get("challengeName", "mock")
+            return {
+                "statusCode": 0,
+                "challengeInfo": {
+                    "challenge": {"id": _number(f"challenge:{name}"), "title": name},
+                    "stats": {"videoCount": total},
+                },
+            }
+        if path == "/api/music/detail/":
+            music_id = q.get("musicId", "0")
+            return {
+                "statusCode": 0,
+                "musicInfo": {"music": {"id": music_id, "title": "original sound"}},
+            }
+
+        if path in (
+            "/api/post/item_list/",
+            "/api/favorite/item_list",
+            "/api/challenge/item_list/",
+            "/api/music/item_list/",
+            "/api/recommend/item_list/",
+            "/api/related/item_list/",
+        ):
+            seed = f"{path}:{q.get('secUid') or q.get('challengeID') or q.get('musicID') or q.get('itemID')}"
+            if path == "/api/recommend/item_list/":
+                with self._lock:
+                    cursor = self._rng.randrange(10**9)
+                total = None
+            indices, has_more, next_cursor = self._page(total, cursor, count)
+            return {
+                "statusCode": 0,
+                "itemList": [_video(seed, i) for i in indices],
+                "hasMore": has_more,
+                "cursor": str(next_cursor),
+            }
+
+        if path == "/api/comment/list/":
+            seed = q.get("aweme_id", "0")
+            indices, has_more, next_cursor = self._page(total, cursor, count)
+            return {
+                "status_code": 0,
+                "comments": [_comment(seed, i) for i in indices],
+                "has_more": int(has_more),
+                "cursor": next_cursor,
+                "total": total,
+            }
+
+        if path == "/api/search/user/full/":
+            keyword = q.get("keyword", "")
+            indices, has_more, next_cursor = self._page(total, cursor, 10)
+            users = [_user(f"{keyword.replace(' ', '')}{i}") for i in indices]
+            return {
+                "status_code": 0,
+                "user_list": [
+                    {
+                        "user_info": {
+                            "user_id": u["id"],
+                            "sec_uid": u["secUid"],
+                            "unique_id": u["uniqueId"],
+                        }
+                    }
+                    for u in users
+                ],
+                "has_more": int(has_more),
+                "cursor": next_cursor,
+            }
+
+        return None
+
+    def video_page(self, path: str) -> Optional[str]:
+        """The HTML of a video's page, None if path isn't a video page"""
+        parts = path.strip("/").split("/")
+        if len(parts) != 3 or not parts[0].startswith("@") or parts[1] != "video":
+            return None
+        item = _video(parts[0], 0, author=parts[0][1:])
+        item["id"] = parts[2]
+        data = {
+            "__DEFAULT_SCOPE__": {
+                "webapp.video-detail": {
+                    "statusCode": 0,
+                    "itemInfo": {"itemStruct": item},
+                }
+            }
+        }
+        return _VIDEO_HTML.format(data=json.dumps(data))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    mock: MockTikTokServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        # Sessions are created on the mock's origin, but requests are for tiktok.com
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin", "*"))
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin", "*"))
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, OPTIONS")
+        self.send_header(
+            "Access-Control-Allow-Headers",
+            self.headers.get("Access-Control-Request-Headers", "*"),
+        )
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path in ("/", ""):
+            self._send(200, _ROOT_HTML.encode(), "text/html; charset=utf-8")
+            return
+
+        delay, error = self.mock._draw()
+        time.sleep(delay)
+        if error == SERVER_ERROR:
+            self._send(500, b"Internal Server Error", "text/plain")
+            return
+
+        page = self.mock.video_page(url.path)
+        if page is not None:
+            self._send(200, page.encode(), "text/html; charset=utf-8")
+            return
+
+        data = self.mock.respond(url.path, parse_qs(url.query))
+        if data is None:
+            self._send(404, b"Not Found", "text/plain")
+            return
+        if error == EMPTY:
+            body = b""
+        elif error == STATUS_CODE:
+            body = json.dumps(
+                {"statusCode": 10000, "status_msg": "mock error"}
+            ).encode()
+        else:
+            body = json.dumps(data).encode()
+        self._send(200, body, "application/json")
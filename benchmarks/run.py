@@ -0,0 +1,255 @@
+"""
+Measures TikTokApi's end-to-end throughput against the mock TikTok server.
+
+Real browser sessions are created on the mock server's page, which signs urls
+with a fake byted_acrawler, and every request they make to www.tiktok.com is
+routed to the mock. So the whole request path is exercised, from the model
+classes through the session pool, signing, fetching, retries and decoding.
+Only TikTok is replaced.
+
+For each session count it reports items per second, the p50 and p99 latency
+of each request and the peak Python memory allocated. tracemalloc slows down
+every allocation, so the peak memory is measured in a second, untimed pass
+of the same workload.
+
+Example Usage:
+    .. code-block:: bash
+
+        python -m benchmarks.run --workload user_videos --sessions 1 2 4 --items 500
+        python -m benchmarks.run --workload comments --error-rate 0.05 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+from TikTokApi import TikTokApi
+
+from .mock_server import LatencyModel, MockTikTokServer
+
+
+class _TimedTikTokApi(TikTokApi):
+    """A TikTokApi recording how long each make_request call takes"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    async def make_request(self, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return await super().make_request(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started_at)
+
+
+async def _user_videos(api, server, worker, items):
+    async for _ in api.user(username=f"mockuser{worker}").videos(count=items):
+        yield
+
+
+async def _user_liked(api, server, worker, items):
+    async for _ in api.user(username=f"mockuser{worker}").liked(count=items):
+        yield
+
+
+async def _hashtag_videos(api, server, worker, items):
+    async for _ in api.hashtag(name=f"mock{worker}").videos(count=items):
+        yield
+
+
+async def _sound_videos(api, server, worker, items):
+    async for _ in api.sound(id=f"70{worker:017d}").videos(count=items):
+        yield
+
+
+async def _trending(api, server, worker, items):
+    async for _ in api.trending.videos(count=items):
+        yield
+
+
+async def _comments(api, server, worker, items):
+    async for _ in api.video(id=f"71{worker:017d}").comments(count=items):
+        yield
+
+
+async def _search_users(api, server, worker, items):
+    async for _ in api.search.users(f"mock user {worker}", count=items):
+        yield
+
+
+async def _video_info(api, server, worker, items):
+    for i in range(items):
+        url = f"{server.url}/@creator{worker}/video/72{worker:05d}{i:012d}"
+        started_at = time.perf_counter()
+        await api.video(url=url).info()
+        api.latencies.append(time.perf_counter() - started_at)
+        yield
+
+
+WORKLOADS = {
+    "user_videos": _user_videos,
+    "user_liked": _user_liked,
+    "hashtag_videos": _hashtag_videos,
+    "sound_videos": _sound_videos,
+    "trending": _trending,
+    "comments": _comments,
+    "search_users": _search_users,
+    "video_info": _video_info,
+}
+
+
+async def _route_to_mock(route, base_url: str):
+    url = urlparse(route.request.url)
+    target = f"{base_url}{url.path}" + (f"?{url.query}" if url.query else "")
+    response = await route.fetch(url=target)
+    await route.fulfill(response=response)
+
+
+def _percentile(values: list, q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+async def run_benchmark(
+    server: MockTikTokServer,
+    workload: str,
+    num_sessions: int,
+    concurrency: int,
+    items: int,
+    api_kwargs: dict = None,
+    measure_memory: bool = True,
+) -> dict:
+    """
+    Run one workload against the mock server.
+
+    Args:
+        server (MockTikTokServer): The running mock server.
+        workload (str): The name of a workload in WORKLOADS.
+        num_sessions (int): The number of browser sessions to create.
+        concurrency (int): The number of workers paginating at once.
+        items (int): The number of items each worker fetches.
+        api_kwargs (dict): Extra arguments for TikTokApi.
+        measure_memory (bool): Run the workload a second time under tracemalloc for peak_memory_mb, which is None if False.
+
+    Returns:
+        dict: The workload, sessions, concurrency, items, seconds, items_per_second, requests, p50_ms, p99_ms and peak_memory_mb of the run.
+    """
+    iterate = WORKLOADS[workload]
+    async with _TimedTikTokApi(**(api_kwargs or {})) as api:
+        await api.create_sessions(
+            num_sessions=num_sessions,
+            ms_tokens=["mock-ms-token"] * num_sessions,
+            starting_url=server.url,
+            sleep_after=0,
+        )
+        for session in api.sessions:
+            await session.context.route(
+                "https://www.tiktok.com/api/**",
+                lambda route: _route_to_mock(route, server.url),
+            )
+
+        async def run_workers() -> int:
+            fetched = 0
+
+            async def worker(i: int):
+                nonlocal fetched
+                async for _ in iterate(api, server, i, items):
+                    fetched += 1
+
+            await asyncio.gather(*(worker(i) for i in range(concurrency)))
+            return fetched
+
+        requests_before = server.requests
+        started_at = time.perf_counter()
+        fetched = await run_workers()
+        seconds = time.perf_counter() - started_at
+        requests = server.requests - requests_before
+        latencies = list(api.latencies)
+
+        peak_memory = None
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                await run_workers()
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        return {
+            "workload": workload,
+            "sessions": num_sessions,
+            "concurrency": concurrency,
+            "items": fetched,
+            "seconds": round(seconds, 3),
+            "items_per_second": round(fetched / seconds, 1),
+            "requests": requests,
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+            "peak_memory_mb": (
+                round(peak_memory / 2**20, 1) if peak_memory is not None else None
+            ),
+        }
+
+
+def _print_table(results: list[dict]):
+    columns = list(results[0].keys())
+    widths = [max(len(c), *(len(str(r[c])) for r in results)) for c in columns]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for r in results:
+        print("  ".join(str(r[c]).rjust(w) for c, w in zip(columns, widths)))
+
+
+async def main(args: argparse.Namespace):
+    latency = LatencyModel(median=args.latency_ms / 1000, sigma=args.latency_sigma)
+    results = []
+    with MockTikTokServer(
+        latency=latency,
+        error_rate=args.error_rate,
+        items_per_object=args.items_per_object,
+        seed=args.seed,
+    ) as server:
+        for num_sessions in args.sessions:
+            result = await run_benchmark(
+                server,
+                args.workload,
+                num_sessions,
+                args.concurrency,
+                args.items,
+                measure_memory=not args.no_memory,
+            )
+            results.append(result)
+
+    _print_table(results)
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--workload", choices=WORKLOADS, default="user_videos")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--items-per-object", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the second pass that measures peak memory",
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
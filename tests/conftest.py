@@ -0,0 +1,73 @@
+from TikTokApi import TikTokApi
+from TikTokApi.tiktok import TikTokPlaywrightSession, _SIGNED_FETCH_TIMED_JS
+import asyncio
+import json
+import pytest
+
+
+class FakePage:
+    """Answers the signing bridge with a canned response"""
+
+    def __init__(self, body=None, delay=0.01, fail_times=0, timings=(0.0, 0.0, 0.0)):
+        """
+        Args:
+            body (dict): The response to answer with.
+            delay (float): The seconds each answer takes.
+            fail_times (int): How many of the first requests get an empty body.
+            timings (tuple): The wait_signer, sign and fetch milliseconds the timed bridge reports.
+        """
+        self.body = body if body is not None else {"status_code": 0}
+        self.delay = delay
+        self.fail_times = fail_times
+        self.timings = timings
+        self.urls = []
+        self.scripts = []
+        self.args = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def evaluate(self, script, arg=None):
+        self.urls.append(arg[0])
+        self.scripts.append(script)
+        self.args.append(arg)
+        failed = len(self.urls) <= self.fail_times
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        body = "" if failed else json.dumps(self.body)
+        if script == _SIGNED_FETCH_TIMED_JS:
+            return [body, *self.timings]
+        return body
+
+
+def create_session(page):
+    return TikTokPlaywrightSession(
+        None, page, params={}, headers={}, ms_token="token", bridge_installed=True
+    )
+
+
+@pytest.fixture
+def make_page():
+    """Creates FakePages, see FakePage for the arguments"""
+    return FakePage
+
+
+@pytest.fixture
+def make_api():
+    """Creates a TikTokApi with a bridged session for each page"""
+
+    def create_api(*pages, **kwargs):
+        api = TikTokApi(**kwargs)
+        for page in pages:
+            api.sessions.append(create_session(page))
+        return api
+
+    return create_api
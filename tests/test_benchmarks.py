@@ -0,0 +1,62 @@
+from benchmarks.mock_server import LatencyModel, MockTikTokServer
+from benchmarks.run import parse_args
+from TikTokApi.tiktok import _SIGNED_FETCH_TIMED_JS
+from urllib.parse import urlparse
+import asyncio
+import json
+import urllib.request
+import pytest
+
+
+class MockServerPage:
+    """Sends the signing bridge's requests to the mock server instead of TikTok"""
+
+    def __init__(self, server):
+        self.server = server
+
+    async def evaluate(self, script, arg=None):
+        url = urlparse(arg[0])
+        target = f"{self.server.url}{url.path}?{url.query}"
+        body = await asyncio.to_thread(self._get, target)
+        if script == _SIGNED_FETCH_TIMED_JS:
+            return [body, 0.0, 0.0, 0.0]
+        return body
+
+    def _get(self, url):
+        with urllib.request.urlopen(url) as response:
+            return response.read().decode("utf-8")
+
+
+@pytest.fixture
+def server():
+    with MockTikTokServer(
+        latency=LatencyModel(median=0.001, sigma=0), items_per_object=45, seed=0
+    ) as server:
+        yield server
+
+
+def test_mock_server_paginates(server):
+    url = f"{server.url}/api/post/item_list/?secUid=sec&count=30&cursor=30"
+    with urllib.request.urlopen(url) as response:
+        body = json.loads(response.read())
+
+    assert len(body["itemList"]) == 15
+    assert body["hasMore"] is False
+    assert server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_api_round_trip_against_mock_server(server, make_api):
+    api = make_api(MockServerPage(server))
+
+    videos = [v async for v in api.user(username="mockuser").videos(count=45)]
+
+    assert len(videos) == 45
+    assert len({v.id for v in videos}) == 45
+    # One user/detail/ for the secUid, then two pages of videos
+    assert server.requests == 3
+
+
+def test_memory_pass_can_be_skipped():
+    assert parse_args([]).no_memory is False
+    assert parse_args(["--no-memory"]).no_memory is True
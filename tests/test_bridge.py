@@ -0,0 +1,78 @@
+from TikTokApi.metrics import Metrics
+from TikTokApi.tiktok import _SIGNED_FETCH_JS, _SIGNED_FETCH_TIMED_JS
+from playwright.async_api import Error as PlaywrightError
+import pytest
+
+URL = "https://www.tiktok.com/api/user/detail/"
+
+
+class FailingBridgePage:
+    """A page whose bridge always rejects with message, like Playwright surfaces a thrown Error"""
+
+    def __init__(self, message):
+        self.message = message
+        self.calls = 0
+
+    async def evaluate(self, script, arg=None):
+        self.calls += 1
+        raise PlaywrightError(f"Error: {self.message}\n    at <anonymous>:1:1")
+
+
+@pytest.mark.asyncio
+async def test_bridge_is_called_with_url_headers_and_signer_timeout(
+    make_page, make_api
+):
+    page = make_page()
+    api = make_api(page)
+    api.sessions[0].headers = {"user-agent": "test"}
+    api.signer_timeout = 1.5
+
+    await api.make_request(URL, params={"uniqueId": "a"})
+
+    assert page.scripts == [_SIGNED_FETCH_JS]
+    url, headers, timeout = page.args[0]
+    assert url == f"{URL}?uniqueId=a&msToken=token"
+    assert headers == {"user-agent": "test"}
+    assert timeout == 1500
+
+
+@pytest.mark.asyncio
+async def test_timed_bridge_reports_stage_timings(make_page, make_api):
+    page = make_page(timings=(1.0, 2.0, 30.0))
+    api = make_api(page, metrics=Metrics())
+
+    await api.make_request(URL, params={"uniqueId": "a"})
+
+    assert page.scripts == [_SIGNED_FETCH_TIMED_JS]
+    assert page.args[0][2] == api.signer_timeout * 1000
+    histograms = api.metrics.snapshot()["histograms"]
+    assert histograms["fetch"][0]["sum"] == pytest.approx(0.03)
+
+
+@pytest.mark.asyncio
+async def test_missing_x_bogus_surfaces_without_retrying(make_api):
+    page = FailingBridgePage("Failed to generate X-Bogus")
+    api = make_api(page)
+    api.retry_policy.backoff = 0
+
+    with pytest.raises(PlaywrightError, match="Failed to generate X-Bogus"):
+        await api.make_request(URL, params={"uniqueId": "a"})
+
+    assert page.calls == 1
+    assert api.session_pool.stats()[0]["consecutive_errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_signer_timeout_is_retried_as_a_timeout(make_api):
+    page = FailingBridgePage("Timed out waiting for byted_acrawler")
+    api = make_api(page)
+    api.retry_policy.backoff = 0
+
+    with pytest.raises(PlaywrightError, match="Timed out waiting for byted_acrawler"):
+        await api.make_request(URL, params={"uniqueId": "a"})
+
+    assert page.calls == api.retry_policy.max_attempts
+    assert (
+        api.session_pool.stats()[0]["consecutive_errors"]
+        == api.retry_policy.max_attempts
+    )
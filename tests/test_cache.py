@@ -0,0 +1,60 @@
+from TikTokApi.cache import ResponseCache
+import asyncio
+import pytest
+
+
+def test_lru_eviction_and_counters():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"id": "a"}, ttl=60)
+    cache.set("b", {"id": "b"}, ttl=60)
+    assert cache.get("a") == ({"id": "a"}, False)
+
+    cache.set("c", {"id": "c"}, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("c") == ({"id": "c"}, False)
+    assert cache.stats() == {
+        "hits": 2,
+        "stale_hits": 0,
+        "misses": 1,
+        "evictions": 1,
+        "entries": 2,
+        "bytes": cache.bytes,
+    }
+
+
+def test_byte_bound():
+    cache = ResponseCache(max_entries=None, max_bytes=100)
+    cache.set("a", "x", ttl=60, size=60)
+    cache.set("b", "y", ttl=60, size=60)
+    assert cache.get("a") is None
+    assert cache.bytes == 60
+
+
+def test_stale_then_expired():
+    cache = ResponseCache(stale_ttl=0.05)
+    cache.set("a", 1, ttl=0)
+    assert cache.get("a") == (1, True)
+    cache.set("a", 1, ttl=-0.05)
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_info_responses_are_cached_and_revalidated(make_page, make_api):
+    page = make_page({"status_code": 0, "userInfo": {}})
+    api = make_api(page, response_cache=ResponseCache(stale_ttl=60))
+    url = "https://www.tiktok.com/api/user/detail/"
+
+    first = await api.make_request(url, params={"uniqueId": "a"})
+    assert await api.make_request(url, params={"uniqueId": "a"}) is first
+    assert len(page.urls) == 1
+
+    await api.make_request("https://www.tiktok.com/api/post/item_list/", params={})
+    await api.make_request("https://www.tiktok.com/api/post/item_list/", params={})
+    assert len(page.urls) == 3
+
+    key = next(iter(api.response_cache._entries))
+    api.response_cache.set(key, first, ttl=0)
+    assert await api.make_request(url, params={"uniqueId": "a"}) is first
+    await asyncio.gather(*api._background_tasks)
+    assert len(page.urls) == 4
+    assert api.response_cache.get(key)[0] is not first
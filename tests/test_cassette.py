@@ -0,0 +1,111 @@
+from TikTokApi import TikTokApi
+from TikTokApi.cassette import Cassette
+from TikTokApi.exceptions import NotFoundException
+from TikTokApi.helpers import request_key
+import json
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_recorded_pagination_replays_without_sessions(
+    tmp_path, make_page, make_api
+):
+    path = str(tmp_path / "cassette.jsonl")
+    page = make_page({"statusCode": 0, "itemList": [], "hasMore": False})
+    api = make_api(page, cassette=Cassette(path, mode="record"))
+    user = api.user(user_id="1", sec_uid="sec", username="therock")
+    await api.make_request(
+        "https://www.tiktok.com/api/user/detail/", params={"uniqueId": "therock"}
+    )
+    recorded = [v async for v in user.videos()]
+    api.cassette.close()
+    assert api.cassette.recorded == 2
+
+    api = TikTokApi(cassette=Cassette(path, speed=1000))
+    replayed = [v async for v in api.user(sec_uid="sec").videos()]
+    assert replayed == recorded == []
+    data = await api.make_request(
+        "https://www.tiktok.com/api/user/detail/",
+        params={"uniqueId": "therock", "msToken": "new"},
+    )
+    assert data == page.body
+    assert api.cassette.replayed == 2
+
+    with pytest.raises(KeyError):
+        await api.make_request("https://www.tiktok.com/api/unknown/")
+
+
+@pytest.mark.asyncio
+async def test_video_info_replays_recorded_page(tmp_path):
+    url = "https://www.tiktok.com/@therock/video/123"
+    item = {
+        "id": "123",
+        "createTime": 0,
+        "stats": {},
+        "author": {"id": "1", "secUid": "sec", "uniqueId": "therock"},
+        "music": {"id": "9", "title": "original sound"},
+    }
+    state = {
+        "__DEFAULT_SCOPE__": {"webapp.video-detail": {"itemInfo": {"itemStruct": item}}}
+    }
+    html = (
+        '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+        f"{json.dumps(state)}</script>"
+    )
+    path = tmp_path / "cassette.jsonl"
+    path.write_text(json.dumps({"key": url, "body": html, "elapsed": 0.1}) + "\n")
+
+    api = TikTokApi(cassette=Cassette(str(path)))
+    video = api.video(url=url)
+    assert video.id == "123"
+    video_info, text = await video.info()
+    assert video_info == item
+    assert video.author.sec_uid == "sec"
+    assert text == html
+
+
+@pytest.mark.asyncio
+async def test_replay_works_as_a_context_manager(tmp_path):
+    url = "https://www.tiktok.com/api/user/detail/"
+    params = {"uniqueId": "therock"}
+    body = {"statusCode": 0, "userInfo": {}}
+    path = tmp_path / "cassette.jsonl"
+    entry = {"key": request_key(url, params), "body": json.dumps(body), "elapsed": 0}
+    path.write_text(json.dumps(entry) + "\n")
+
+    async with TikTokApi(cassette=Cassette(str(path))) as api:
+        assert await api.make_request(url, params=params) == body
+    assert api.browser is None and api.playwright is None
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_replay_their_exception(tmp_path, make_page, make_api):
+    path = str(tmp_path / "cassette.jsonl")
+    page = make_page({"statusCode": 10202, "status_msg": "user not exist"})
+    api = make_api(page, cassette=Cassette(path, mode="record"))
+    with pytest.raises(NotFoundException):
+        await api.user(username="gone").info()
+    api.cassette.close()
+
+    api = TikTokApi(cassette=Cassette(path))
+    with pytest.raises(NotFoundException):
+        await api.user(username="gone").info()
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_are_recorded(tmp_path, make_api):
+    class BatchPage:
+        async def evaluate(self, script, arg=None):
+            return [[json.dumps({"statusCode": 0}), None], [None, "net::ERR_FAILED"]]
+
+    url = "https://www.tiktok.com/api/user/detail/"
+    batch = [{"url": url, "params": {"uniqueId": u}} for u in ("a", "b")]
+    path = str(tmp_path / "cassette.jsonl")
+    api = make_api(BatchPage(), cassette=Cassette(path, mode="record"))
+    recorded = await api.make_requests(batch, return_exceptions=True)
+    api.cassette.close()
+
+    api = TikTokApi(cassette=Cassette(path))
+    replayed = await api.make_requests(batch, return_exceptions=True)
+    assert replayed[0] == recorded[0] == {"statusCode": 0}
+    assert str(replayed[1]) == str(recorded[1]) == "Failed to fetch: net::ERR_FAILED"
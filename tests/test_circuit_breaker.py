@@ -0,0 +1,75 @@
+from TikTokApi.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+)
+from TikTokApi.exceptions import CircuitOpenException, EmptyResponseException
+from TikTokApi.retry import RetryPolicy
+import pytest
+
+
+def test_breaker_opens_on_failure_rate_and_probes_when_half_open():
+    breaker = CircuitBreaker(failure_rate=0.5, window=4, min_requests=4, open_for=0)
+    for failed in (True, False, True):
+        breaker.record(failed)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    breaker.open_for = 60
+    assert not breaker.allow()
+
+    breaker.record(False)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(min_requests=1, open_for=0)
+    breaker.record(True)
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == OPEN
+    assert breaker.opened == 2
+
+
+@pytest.mark.asyncio
+async def test_open_endpoint_fails_fast_without_blocking_others(make_page, make_api):
+    page = make_page(fail_times=2)
+    api = make_api(
+        page,
+        circuit_breakers=CircuitBreakers(min_requests=2, open_for=60),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+    failing = "https://www.tiktok.com/api/favorite/item_list/"
+
+    for _ in range(2):
+        with pytest.raises(EmptyResponseException):
+            await api.make_request(failing, coalesce=False)
+    with pytest.raises(CircuitOpenException):
+        await api.make_request(failing, coalesce=False)
+    assert len(page.urls) == 2
+
+    await api.make_request("https://www.tiktok.com/api/user/detail/")
+    assert len(page.urls) == 3
+    stats = api.circuit_breakers.stats()
+    assert stats["/api/favorite/item_list/"]["state"] == OPEN
+    assert stats["/api/user/detail/"]["state"] == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_once_the_breaker_opens(make_page, make_api):
+    page = make_page(fail_times=10)
+    api = make_api(
+        page,
+        circuit_breakers=CircuitBreakers(min_requests=2, open_for=60),
+        retry_policy=RetryPolicy(max_attempts=5, backoff=0, jitter=0),
+    )
+
+    with pytest.raises(CircuitOpenException):
+        await api.make_request("https://www.tiktok.com/api/search/general/full/")
+    assert len(page.urls) == 2
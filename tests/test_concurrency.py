@@ -0,0 +1,131 @@
+from TikTokApi.concurrency import ConcurrencyController
+from TikTokApi.metrics import Metrics
+from TikTokApi.rate_limit import RateLimiter
+from TikTokApi.session_pool import PRIORITY_BULK, PRIORITY_INTERACTIVE
+import asyncio
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_healthy_and_shrinks_when_slow():
+    controller = ConcurrencyController(initial_limit=2, latency_target=1.0)
+
+    for _ in range(2):
+        await controller.acquire()
+    for _ in range(2):
+        controller.release(0.1)
+    assert controller.limit == 3
+    assert controller.increases == 1
+
+    for _ in range(3):
+        await controller.acquire()
+    for _ in range(3):
+        controller.release(5.0)
+    assert controller.limit == 1.5
+    assert controller.stats()["latency"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_errors_shrink_the_limit_and_unsaturated_rounds_hold_it():
+    controller = ConcurrencyController(initial_limit=4, error_rate_target=0.2)
+    for _ in range(4):
+        await controller.acquire()
+        controller.release(0.1)
+    assert controller.limit == 4
+
+    for failed in (True, False, False, False):
+        await controller.acquire()
+        controller.release(0.1, failed=failed)
+    assert controller.limit == 2
+    assert controller.stats()["error_rate"] == 0.25
+
+
+@pytest.mark.asyncio
+async def test_make_request_stays_within_the_limit(make_page, make_api):
+    page = make_page()
+    controller = ConcurrencyController(initial_limit=2, max_limit=2)
+    api = make_api(page, concurrency=controller)
+
+    await asyncio.gather(
+        *(
+            api.make_request(
+                "https://www.tiktok.com/api/user/detail/", params={"uniqueId": i}
+            )
+            for i in range(6)
+        )
+    )
+
+    assert len(page.urls) == 6
+    assert page.max_in_flight == 2
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_do_not_count_as_latency(make_page, make_api):
+    page = make_page(delay=0.01)
+    controller = ConcurrencyController(initial_limit=4, latency_target=0.05)
+    api = make_api(
+        page, concurrency=controller, rate_limiter=RateLimiter(session_rate=20)
+    )
+
+    await asyncio.gather(
+        *(
+            api.make_request(
+                "https://www.tiktok.com/api/user/detail/", params={"uniqueId": i}
+            )
+            for i in range(8)
+        )
+    )
+
+    assert api.rate_limiter.waited > 0.3
+    assert controller.decreases == 0
+    assert controller.latency < 0.05
+
+
+@pytest.mark.asyncio
+async def test_window_is_exposed_as_gauges(make_page, make_api):
+    controller = ConcurrencyController(initial_limit=1)
+    make_api(make_page(), concurrency=controller, metrics=Metrics())
+
+    async with controller.slot():
+        pass
+
+    metrics = controller.metrics
+    assert metrics.snapshot()["gauges"]["concurrency_limit"][0]["value"] == 2
+    assert "tiktokapi_concurrency_in_flight 0" in metrics.prometheus()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_give_up_their_place():
+    controller = ConcurrencyController(initial_limit=1)
+    await controller.acquire()
+    waiter = asyncio.ensure_future(controller.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    controller.release(0.1)
+    assert controller.stats()["waiting"] == 0
+    await asyncio.wait_for(controller.acquire(), 1)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_by_aged_priority():
+    controller = ConcurrencyController(initial_limit=1, max_limit=1, aging=0)
+    order = []
+
+    async def request(name, priority):
+        async with controller.slot(priority):
+            order.append(name)
+
+    async with controller.slot():
+        tasks = []
+        for name, priority in [
+            ("bulk", PRIORITY_BULK),
+            ("interactive", PRIORITY_INTERACTIVE),
+        ]:
+            tasks.append(asyncio.ensure_future(request(name, priority)))
+            await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks)
+    assert order == ["interactive", "bulk"]
@@ -0,0 +1,60 @@
+from TikTokApi.cache import SQLiteResponseCache
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_round_trip_and_expiry(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"))
+    body = '{"status_code": 0, "desc": "' + "x" * 1000 + '"}'
+    await cache.set("a", body, ttl=60)
+    await cache.set("b", "{}", ttl=-1)
+
+    assert await cache.get("a") == body
+    assert await cache.get("b") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] < len(body)
+    cache.close()
+
+    reopened = SQLiteResponseCache(str(tmp_path / "cache.db"))
+    assert await reopened.get("a") == body
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_compaction_drops_least_recently_used(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"), max_bytes=250)
+    for key in "abc":
+        await cache.set(key, "x" * 100, ttl=60)
+    await cache.get("a")
+    await cache.compact()
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert await cache.get("c") is not None
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_make_request_reads_through_disk_cache(tmp_path, make_page, make_api):
+    page = make_page({"status_code": 0, "itemList": []})
+    path = str(tmp_path / "cache.db")
+    api = make_api(page, coalesce_requests=False, disk_cache=SQLiteResponseCache(path))
+    url = "https://www.tiktok.com/api/post/item_list/"
+
+    first = await api.make_request(url, params={"secUid": "a", "msToken": "1"})
+    second = await api.make_request(url, params={"secUid": "a", "msToken": "2"})
+    assert first == second
+    assert len(page.urls) == 1
+
+    await api.make_request("https://www.tiktok.com/api/recommend/item_list/", params={})
+    await api.make_request("https://www.tiktok.com/api/recommend/item_list/", params={})
+    assert len(page.urls) == 3
+    api.disk_cache.close()
+
+    page = make_page({"status_code": 10201})
+    api = make_api(page, disk_cache=SQLiteResponseCache(path))
+    assert await api.make_request(url, params={"secUid": "a"}) == first
+    assert page.urls == []
+    api.disk_cache.close()
@@ -0,0 +1,74 @@
+from TikTokApi.hedging import Hedging
+from TikTokApi.retry import RetryBudget
+import asyncio
+import pytest
+
+URL = "https://www.tiktok.com/api/item/detail/"
+
+
+@pytest.fixture
+def make_hedged_api(make_api):
+    def create_hedged_api(slow, fast, hedging):
+        api = make_api(slow, fast, hedging=hedging)
+        # Make the slow session look less loaded so it's picked first
+        api.sessions[1].stats.latency = 10.0
+        for _ in range(hedging.min_samples):
+            hedging.record("/api/item/detail/", 0.02)
+        return api
+
+    return create_hedged_api
+
+
+def test_delay_is_the_percentile_of_recent_latencies():
+    hedging = Hedging(percentile=0.9, min_samples=5)
+    for latency in range(1, 10):
+        hedging.record("/api/item/detail/", latency / 10)
+    assert hedging.delay("/api/item/detail/") == 0.9
+    assert hedging.delay("/api/user/detail/") is None
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_on_another_session(make_page, make_hedged_api):
+    slow, fast = make_page(delay=5), make_page()
+    hedging = Hedging(min_samples=5)
+    api = make_hedged_api(slow, fast, hedging)
+
+    response = await asyncio.wait_for(api.make_request(URL), 1)
+
+    assert response == {"status_code": 0}
+    assert len(fast.urls) == 1
+    assert slow.cancelled == 1
+    assert hedging.stats()["hedges"] == 1
+    assert hedging.stats()["wins"] == 1
+    assert [s.stats.in_flight for s in api.sessions] == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped_by_the_budget(make_page, make_hedged_api):
+    slow, fast = make_page(delay=0.1), make_page()
+    hedging = Hedging(
+        min_samples=5,
+        budget=RetryBudget(ratio=0, min_per_second=0, max_balance=0),
+    )
+    api = make_hedged_api(slow, fast, hedging)
+
+    await api.make_request(URL)
+
+    assert fast.urls == []
+    assert len(slow.urls) == 1
+    assert hedging.stats()["refused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_other_sessions_are_full(make_page, make_hedged_api):
+    slow, fast = make_page(delay=0.1), make_page()
+    hedging = Hedging(min_samples=5)
+    api = make_hedged_api(slow, fast, hedging)
+    api.session_pool.max_concurrency = 1
+    api.sessions[1].stats.in_flight = 1
+
+    await api.make_request(URL)
+
+    assert fast.urls == []
+    assert len(slow.urls) == 1
+    assert hedging.stats()["hedges"] == 0
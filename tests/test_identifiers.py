@@ -0,0 +1,89 @@
+from TikTokApi.api.hashtag import Hashtag
+from TikTokApi.api.user import User
+from TikTokApi.identifiers import IdentifierCache
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_ids_persist_to_disk(tmp_path):
+    path = str(tmp_path / "identifiers.db")
+    cache = IdentifierCache(path)
+    cache.add_user("TheRock", "1", "sec")
+    cache.add_user("incomplete", None, "sec")
+    cache.add_hashtag("funny", "5424")
+    await cache.flush()
+    cache.close()
+
+    cache = IdentifierCache(path)
+    # Constructors only look in memory, the paginators load from disk
+    assert cache.user("therock") is None
+    assert await cache.load_user("therock") == ("1", "sec")
+    assert cache.user("therock") == ("1", "sec")
+    assert await cache.load_user("incomplete") is None
+    assert await cache.load_hashtag("Funny") == "5424"
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_ids_are_flushed_in_the_background(tmp_path):
+    path = str(tmp_path / "identifiers.db")
+    cache = IdentifierCache(path, flush_every=2)
+    cache.add_hashtag("funny", "5424")
+    cache.add_hashtag("cats", "1")
+    await cache.flush()
+
+    reopened = IdentifierCache(path)
+    assert await reopened.load_hashtag("cats") == "1"
+    reopened.close()
+    cache.close()
+
+
+def test_models_can_be_created_before_an_api(monkeypatch):
+    monkeypatch.delattr(User, "parent", raising=False)
+    monkeypatch.delattr(Hashtag, "parent", raising=False)
+
+    user = User(username="therock")
+    hashtag = Hashtag(name="funny")
+
+    assert user.username == "therock"
+    assert user.sec_uid is None
+    assert hashtag.name == "funny"
+
+
+@pytest.mark.asyncio
+async def test_paginating_skips_info_for_known_ids(make_page, make_api):
+    page = make_page({"statusCode": 0, "itemList": [], "hasMore": False})
+    api = make_api(page)
+    api.user(user_id="1", sec_uid="sec", username="therock")
+    api.hashtag(data={"id": "5424", "title": "funny"})
+
+    async for _ in api.user(username="therock").videos():
+        pass
+    async for _ in api.hashtag(name="funny").videos():
+        pass
+
+    assert len(page.urls) == 2
+    assert "secUid=sec" in page.urls[0]
+    assert "challengeID=5424" in page.urls[1]
+
+
+@pytest.mark.asyncio
+async def test_paginating_loads_ids_from_disk(tmp_path, make_page, make_api):
+    path = str(tmp_path / "identifiers.db")
+    cache = IdentifierCache(path)
+    cache.add_user("therock", "1", "sec")
+    await cache.flush()
+    cache.close()
+
+    page = make_page({"statusCode": 0, "itemList": [], "hasMore": False})
+    api = make_api(page, identifier_cache=IdentifierCache(path))
+    user = api.user(username="therock")
+    assert user.sec_uid is None
+
+    async for _ in user.videos():
+        pass
+
+    assert len(page.urls) == 1
+    assert "secUid=sec" in page.urls[0]
+    api.identifier_cache.close()
@@ -0,0 +1,27 @@
+from TikTokApi.json_codec import JSONCodec
+import json
+import threading
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_small_bodies_decode_on_loop():
+    threads = []
+
+    def loads(text):
+        threads.append(threading.current_thread())
+        return json.loads(text)
+
+    codec = JSONCodec(loads=loads, offload_threshold=100)
+    assert await codec.decode('{"status_code": 0}') == {"status_code": 0}
+    assert threads == [threading.main_thread()]
+
+    big = json.dumps({"itemList": ["x" * 200]})
+    assert (await codec.decode(big))["itemList"] == ["x" * 200]
+    assert threads[1] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        await JSONCodec().decode("<html>")
@@ -0,0 +1,223 @@
+from TikTokApi.circuit_breaker import CircuitBreakers
+from TikTokApi.exceptions import (
+    CircuitOpenException,
+    EmptyResponseException,
+    NotFoundException,
+)
+from TikTokApi.rate_limit import RateLimiter
+from TikTokApi.tiktok import (
+    _FETCH_URLS_JS,
+    _SIGN_URLS_JS,
+    _SIGNED_FETCH_MANY_JS,
+    TikTokPlaywrightSession,
+)
+from urllib.parse import parse_qs, urlparse
+import asyncio
+import json
+import pytest
+
+USER_DETAIL = "https://www.tiktok.com/api/user/detail/"
+
+
+def respond(url):
+    """The [body, error] of a batched fetch, failing for the users missing and empty"""
+    username = parse_qs(urlparse(url).query)["uniqueId"][0]
+    if username == "missing":
+        return [None, "net::ERR_FAILED"]
+    if username == "empty":
+        return ["", None]
+    return [json.dumps({"statusCode": 0, "uniqueId": username}), None]
+
+
+class BatchPage:
+    """Answers the batched signing and fetching scripts"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def wait_for_function(self, expression):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        if script == _SIGNED_FETCH_MANY_JS:
+            requests, _ = arg
+            return [respond(url) for url, _ in requests]
+        if script == _SIGN_URLS_JS:
+            return ["bogus"] * len(arg)
+        if script == _FETCH_URLS_JS:
+            return [respond(url) for url, _ in arg]
+        raise AssertionError(f"Unexpected script {script}")
+
+
+class FakeTransport:
+    def __init__(self):
+        self.urls = []
+
+    async def fetch(self, session, url, headers):
+        self.urls.append(url)
+        body, error = respond(url)
+        if error is not None:
+            raise Exception(error)
+        return body
+
+
+def batch(*usernames):
+    return [{"url": USER_DETAIL, "params": {"uniqueId": u}} for u in usernames]
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_coalesced(make_page, make_api):
+    page = make_page()
+    api = make_api(page)
+    url = "https://www.tiktok.com/api/user/detail/"
+
+    responses = await asyncio.gather(
+        api.make_request(url, params={"uniqueId": "a", "msToken": None}),
+        api.make_request(url, params={"uniqueId": "a", "msToken": "other"}),
+        api.make_request(url, params={"uniqueId": "b"}),
+    )
+
+    assert len(page.urls) == 2
+    assert responses[0] is responses[1]
+    assert api._in_flight_requests == {}
+
+
+@pytest.mark.asyncio
+async def test_coalescing_can_be_turned_off(make_page, make_api):
+    page = make_page()
+    api = make_api(page, coalesce_requests=False)
+    url = "https://www.tiktok.com/api/recommend/item_list/"
+
+    await asyncio.gather(*(api.make_request(url, params={}) for _ in range(3)))
+
+    assert len(page.urls) == 3
+
+
+@pytest.mark.asyncio
+async def test_missing_objects_leave_the_session_healthy(make_page, make_api):
+    page = make_page({"statusCode": 10202, "status_msg": "user not exist"})
+    api = make_api(page)
+
+    for i in range(3):
+        with pytest.raises(NotFoundException):
+            await api.make_request(
+                "https://www.tiktok.com/api/user/detail/", params={"uniqueId": i}
+            )
+
+    assert api.session_pool.stats()[0]["consecutive_errors"] == 0
+    assert api.session_pool.stats()[0]["healthy"]
+
+
+@pytest.mark.asyncio
+async def test_make_requests_keeps_the_batch_order(make_api):
+    page = BatchPage()
+    api = make_api(page)
+
+    responses = await api.make_requests(batch("a", "b", "c"))
+
+    assert [r["uniqueId"] for r in responses] == ["a", "b", "c"]
+    # Every request is signed and fetched in one round trip to the browser
+    assert [script for script, _ in page.calls] == [_SIGNED_FETCH_MANY_JS]
+    assert api.session_pool.stats()[0]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_make_requests_raises_the_first_failure(make_api):
+    api = make_api(BatchPage())
+
+    with pytest.raises(Exception, match="Failed to fetch: net::ERR_FAILED"):
+        await api.make_requests(batch("a", "missing", "empty"))
+
+
+@pytest.mark.asyncio
+async def test_make_requests_can_return_exceptions(make_api):
+    api = make_api(BatchPage())
+
+    responses = await api.make_requests(
+        batch("a", "missing", "empty"), return_exceptions=True
+    )
+
+    assert responses[0]["uniqueId"] == "a"
+    assert str(responses[1]) == "Failed to fetch: net::ERR_FAILED"
+    assert isinstance(responses[2], EmptyResponseException)
+
+
+@pytest.mark.asyncio
+async def test_make_requests_signs_then_fetches_without_the_bridge(make_api):
+    page = BatchPage()
+    api = make_api()
+    api.sessions.append(
+        TikTokPlaywrightSession(None, page, params={}, headers={}, ms_token="token")
+    )
+
+    responses = await api.make_requests(batch("a", "b"), return_exceptions=True)
+
+    assert [r["uniqueId"] for r in responses] == ["a", "b"]
+    assert [script for script, _ in page.calls] == [_SIGN_URLS_JS, _FETCH_URLS_JS]
+    signed = page.calls[1][1]
+    assert all(url.endswith("&X-Bogus=bogus") for url, _ in signed)
+
+
+@pytest.mark.asyncio
+async def test_make_requests_fetches_with_the_transport(make_api):
+    page = BatchPage()
+    api = make_api(page)
+    api.transport = FakeTransport()
+
+    responses = await api.make_requests(batch("a", "missing"), return_exceptions=True)
+
+    assert responses[0]["uniqueId"] == "a"
+    assert str(responses[1]) == "Failed to fetch: net::ERR_FAILED"
+    # The bridge is skipped, the browser only signs
+    assert [script for script, _ in page.calls] == [_SIGN_URLS_JS]
+    assert len(api.transport.urls) == 2
+    assert all("X-Bogus=bogus" in url for url in api.transport.urls)
+
+
+@pytest.mark.asyncio
+async def test_make_requests_is_paced_by_the_rate_limiter(make_api):
+    limiter = RateLimiter(
+        endpoint_rates={"/api/user/detail/": 20}, session_rate=20, cooldown=0
+    )
+    api = make_api(BatchPage(), rate_limiter=limiter)
+
+    started_at = asyncio.get_running_loop().time()
+    await api.make_requests(batch("a", "b", "c", "empty"), return_exceptions=True)
+    elapsed = asyncio.get_running_loop().time() - started_at
+
+    # Four endpoint tokens, then four session tokens, at 20 a second each
+    assert elapsed == pytest.approx(0.3, abs=0.1)
+    stats = limiter.stats()
+    assert stats["endpoints"]["/api/user/detail/"]["slowdowns"] == 1
+    assert stats["sessions"][0]["slowdowns"] == 1
+
+
+@pytest.mark.asyncio
+async def test_make_requests_counts_towards_and_respects_circuit_breakers(make_api):
+    page = BatchPage()
+    breakers = CircuitBreakers(min_requests=4, failure_rate=0.5)
+    api = make_api(page, circuit_breakers=breakers)
+
+    await api.make_requests(batch("a", "b", "missing", "empty"), return_exceptions=True)
+    assert breakers.stats()["/api/user/detail/"]["state"] == "open"
+
+    with pytest.raises(CircuitOpenException):
+        await api.make_requests(batch("a"))
+    assert len(page.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_make_requests_holds_a_slot_per_request(make_api):
+    first, second = BatchPage(), BatchPage()
+    api = make_api(first, second)
+    api.session_pool.max_concurrency = 2
+
+    responses = await api.make_requests(batch("a", "b", "c", "d"))
+
+    assert [r["uniqueId"] for r in responses] == ["a", "b", "c", "d"]
+    # Split into two batches of two, one on each session
+    assert [len(p.calls[0][1][0]) for p in (first, second)] == [2, 2]
+    stats = api.session_pool.stats()
+    assert [s["requests"] for s in stats] == [2, 2]
+    assert [s["in_flight"] for s in stats] == [0, 0]
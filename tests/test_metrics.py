@@ -0,0 +1,44 @@
+from TikTokApi.metrics import Histogram, Metrics
+import pytest
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == pytest.approx(0.1)
+    assert histogram.as_dict()["buckets"] == {0.1: 2, 1.0: 3, float("inf"): 4}
+
+
+@pytest.mark.asyncio
+async def test_make_request_records_stages_and_counters(make_page, make_api):
+    page = make_page(
+        {"statusCode": 0, "userInfo": {}}, fail_times=1, timings=(0.0, 2.0, 30.0)
+    )
+    api = make_api(page, metrics=Metrics())
+    api.retry_policy.backoff = 0
+    await api.make_request(
+        "https://www.tiktok.com/api/user/detail/", params={"uniqueId": "a"}
+    )
+    user = api.user(data={"id": "1", "secUid": "sec", "uniqueId": "a"})
+    assert isinstance(user, api.user)
+
+    snapshot = api.metrics.snapshot()
+    labels = {"endpoint": "/api/user/detail/", "session": "0"}
+    (fetch,) = snapshot["histograms"]["fetch"]
+    assert fetch["labels"] == labels
+    assert fetch["sum"] == pytest.approx(0.03)
+    assert snapshot["histograms"]["sign"][0]["sum"] == pytest.approx(0.002)
+    assert snapshot["histograms"]["decode"][0]["count"] == 1
+    assert snapshot["histograms"]["model"][0]["labels"] == {"model": "user"}
+    assert snapshot["counters"]["retries"][0]["value"] == 1
+    assert snapshot["counters"]["failures"][0]["labels"]["kind"] == "empty_response"
+
+    text = api.metrics.prometheus()
+    assert "# TYPE tiktokapi_fetch_seconds histogram" in text
+    assert (
+        'tiktokapi_fetch_seconds_bucket{endpoint="/api/user/detail/",session="0",le="0.05"} 1'
+        in text
+    )
+    assert 'tiktokapi_requests_total{endpoint="/api/user/detail/"} 1' in text
@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_middleware_runs_in_order_and_can_rewrite(make_page, make_api):
+    page = make_page({"statusCode": 0, "userInfo": {"stats": {"followerCount": 1}}})
+    calls = []
+
+    async def outer(request, call_next):
+        calls.append("outer")
+        response = await call_next(request)
+        calls.append("outer done")
+        return response["userInfo"]
+
+    async def rewrite(request, call_next):
+        calls.append("rewrite")
+        request.params = {**request.params, "uniqueId": "rewritten"}
+        request.options["coalesce"] = False
+        return await call_next(request)
+
+    api = make_api(page, middleware=[outer])
+    api.add_middleware(rewrite)
+    response = await api.make_request(
+        "https://www.tiktok.com/api/user/detail/", params={"uniqueId": "a"}
+    )
+
+    assert response == {"stats": {"followerCount": 1}}
+    assert calls == ["outer", "rewrite", "outer done"]
+    assert "uniqueId=rewritten" in page.urls[0]
+
+
+@pytest.mark.asyncio
+async def test_middleware_can_short_circuit(make_page, make_api):
+    page = make_page()
+
+    async def blocked(request, call_next):
+        if request.endpoint == "/api/recommend/item_list/":
+            return {"itemList": [], "hasMore": False}
+        return await call_next(request)
+
+    api = make_api(page, middleware=[blocked])
+    async for _ in api.trending.videos():
+        pass
+    assert page.urls == []
@@ -0,0 +1,44 @@
+from TikTokApi.cache import NegativeCache
+from TikTokApi.exceptions import (
+    NotFoundException,
+    PrivateAccountException,
+    SoundRemovedException,
+    StatusCodeException,
+)
+import pytest
+
+
+def test_remembers_typed_exceptions_for_their_ttl():
+    cache = NegativeCache(ttls={NotFoundException: 60, PrivateAccountException: -1})
+    cache.record(("user", "a"), NotFoundException(None, "gone", error_code=10202))
+    cache.record(("user", "b"), PrivateAccountException(None, "private"))
+    cache.record(("user", "c"), StatusCodeException(None, "try again"))
+
+    with pytest.raises(NotFoundException) as e:
+        cache.check(("user", "a"))
+    assert e.value.error_code == 10202
+    cache.check(("user", "b"))
+    cache.check(("user", "c"))
+    assert cache.stats() == {"hits": 1, "entries": 1}
+
+
+@pytest.mark.asyncio
+async def test_missing_users_are_not_requested_again(make_page, make_api):
+    page = make_page({"statusCode": 10202, "status_msg": "user not exist"})
+    api = make_api(page, negative_cache=NegativeCache())
+
+    for _ in range(2):
+        with pytest.raises(NotFoundException):
+            await api.user(username="missing").info()
+    assert len(page.urls) == 1
+
+
+@pytest.mark.asyncio
+async def test_removed_sounds_raise_sound_removed(make_page, make_api):
+    page = make_page({"statusCode": 0, "musicInfo": {"music": {"id": ""}}})
+    api = make_api(page, negative_cache=NegativeCache())
+
+    for _ in range(2):
+        with pytest.raises(SoundRemovedException):
+            await api.sound(id="123").info()
+    assert len(page.urls) == 1
@@ -0,0 +1,74 @@
+from TikTokApi.rate_limit import AdaptiveTokenBucket, RateLimiter
+from TikTokApi.retry import EMPTY_RESPONSE, RetryPolicy
+import asyncio
+import time
+import pytest
+
+
+def test_bucket_slows_down_once_per_cooldown_and_recovers():
+    bucket = AdaptiveTokenBucket(10, recovery=0.1, cooldown=60)
+    bucket.slow_down()
+    bucket.slow_down()
+    assert bucket.rate == 5
+    assert bucket.slowdowns == 1
+
+    for _ in range(3):
+        bucket.speed_up()
+    assert bucket.rate == pytest.approx(8)
+    for _ in range(10):
+        bucket.speed_up()
+    assert bucket.rate == 10
+
+
+def test_bucket_queues_reservations():
+    bucket = AdaptiveTokenBucket(10, burst=2)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[:2] == [0, 0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_requests_are_paced_per_endpoint(make_page, make_api):
+    page = make_page()
+    limiter = RateLimiter(endpoint_rates={"/api/comment/list/": 20})
+    api = make_api(page, rate_limiter=limiter)
+
+    started_at = time.monotonic()
+    await asyncio.gather(
+        *(
+            api.make_request(
+                "https://www.tiktok.com/api/comment/list/", params={"cursor": i}
+            )
+            for i in range(5)
+        ),
+        api.make_request("https://www.tiktok.com/api/user/detail/"),
+    )
+
+    assert len(page.urls) == 6
+    assert time.monotonic() - started_at >= 0.2
+    assert list(limiter.stats()["endpoints"]) == ["/api/comment/list/"]
+
+
+@pytest.mark.asyncio
+async def test_empty_responses_slow_down_the_endpoint_and_session(make_page, make_api):
+    page = make_page(fail_times=1)
+    limiter = RateLimiter(
+        endpoint_rates={"/api/post/item_list/": 100}, session_rate=100, recovery=0
+    )
+    api = make_api(
+        page,
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(backoff=0, jitter=0, switch_session=False),
+    )
+
+    await api.make_request("https://www.tiktok.com/api/post/item_list/")
+
+    stats = limiter.stats()
+    assert stats["endpoints"]["/api/post/item_list/"]["rate"] == 50
+    assert stats["sessions"][0]["rate"] == 50
+    assert stats["sessions"][0]["slowdowns"] == 1
+
+    # Failures within the cooldown are part of the same slowdown
+    limiter.record("/api/post/item_list/", 0, EMPTY_RESPONSE)
+    assert limiter.stats()["sessions"][0]["slowdowns"] == 1
@@ -0,0 +1,65 @@
+from TikTokApi.exceptions import EmptyResponseException, StatusCodeException
+from TikTokApi.retry import (
+    RetryBudget,
+    RetryPolicy,
+    classify_failure,
+    EMPTY_RESPONSE,
+    STATUS_CODE,
+    TIMEOUT,
+)
+import asyncio
+import pytest
+
+
+def test_classify_failure():
+    assert classify_failure(EmptyResponseException("", "empty")) == EMPTY_RESPONSE
+    assert classify_failure(StatusCodeException({}, "bad", error_code=1)) == STATUS_CODE
+    assert classify_failure(TimeoutError()) == TIMEOUT
+    assert classify_failure(KeyError()) is None
+
+
+def test_policy_stops_at_max_attempts():
+    policy = RetryPolicy(max_attempts=3, retry_on=(TIMEOUT,))
+    assert policy.should_retry(TIMEOUT, 1)
+    assert policy.should_retry(TIMEOUT, 2)
+    assert not policy.should_retry(TIMEOUT, 3)
+    assert not policy.should_retry(EMPTY_RESPONSE, 1)
+
+
+def test_policy_delay_is_jittered_and_capped():
+    policy = RetryPolicy(backoff=1.0, max_backoff=4.0, jitter=0.5)
+    for attempt in range(1, 6):
+        delay = policy.delay(attempt)
+        expected = min(2 ** (attempt - 1), 4.0)
+        assert expected / 2 <= delay <= expected
+
+
+def test_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_per_second=0, max_balance=2)
+    policy = RetryPolicy(budget=budget)
+
+    assert policy.should_retry(TIMEOUT, 1)
+    assert policy.should_retry(TIMEOUT, 1)
+    assert not policy.should_retry(TIMEOUT, 1)
+    assert budget.exhausted == 1
+
+    budget.record_request()
+    budget.record_request()
+    assert policy.should_retry(TIMEOUT, 1)
+
+
+@pytest.mark.asyncio
+async def test_hung_attempts_time_out_and_free_their_session(make_page, make_api):
+    page = make_page(delay=10)
+    policy = RetryPolicy(max_attempts=2, backoff=0, attempt_timeout=0.05)
+    api = make_api(page, retry_policy=policy)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            api.make_request("https://www.tiktok.com/api/user/detail/"), 1
+        )
+
+    assert page.cancelled == 2
+    stats = api.session_pool.stats()[0]
+    assert stats["in_flight"] == 0
+    assert stats["consecutive_errors"] == 2
@@ -0,0 +1,78 @@
+from TikTokApi import TikTokApi
+from TikTokApi.tiktok import TikTokPlaywrightSession
+import pytest
+
+
+def test_encoded_params_are_cached_until_params_change():
+    session = TikTokPlaywrightSession(None, None, params={"aid": "1988", "from_page": "user"})
+    assert session.encoded_params() == "aid=1988&from_page=user"
+    assert session.encoded_params(frozenset({"from_page"})) == "aid=1988"
+
+    session.params = {"aid": "1233"}
+    assert session.encoded_params() == "aid=1233"
+
+
+@pytest.mark.asyncio
+async def test_endpoint_params_override_session_params():
+    api = TikTokApi()
+    session = TikTokPlaywrightSession(
+        None,
+        None,
+        params={"aid": "1988", "from_page": "user"},
+        headers={"user-agent": "test"},
+        ms_token="token",
+    )
+    url, headers = await api._prepare_request(
+        session,
+        "https://www.tiktok.com/api/search/user/full/",
+        params={"keyword": "a b", "from_page": "search", "msToken": None},
+    )
+
+    assert url == (
+        "https://www.tiktok.com/api/search/user/full/"
+        "?aid=1988&keyword=a%20b&from_page=search&msToken=token"
+    )
+    assert headers == {"user-agent": "test"}
+
+
+class TokenAfterPollsContext:
+    """A browser context whose cookies gain an msToken after polls_needed reads"""
+
+    def __init__(self, polls_needed):
+        self.polls_needed = polls_needed
+        self.polls = 0
+
+    async def cookies(self):
+        self.polls += 1
+        cookies = [{"name": "ttwid", "value": "1"}]
+        if self.polls_needed is not None and self.polls >= self.polls_needed:
+            cookies.append({"name": "msToken", "value": "token"})
+        return cookies
+
+
+@pytest.mark.asyncio
+async def test_wait_for_ms_token_polls_until_it_is_set():
+    api = TikTokApi()
+    context = TokenAfterPollsContext(polls_needed=3)
+    session = TikTokPlaywrightSession(context, None)
+
+    ms_token = await api._TikTokApi__wait_for_ms_token(
+        session, timeout=1, poll_interval=0.01
+    )
+
+    assert ms_token == "token"
+    assert context.polls == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_for_ms_token_returns_none_after_timeout():
+    api = TikTokApi()
+    context = TokenAfterPollsContext(polls_needed=None)
+    session = TikTokPlaywrightSession(context, None)
+
+    ms_token = await api._TikTokApi__wait_for_ms_token(
+        session, timeout=0.05, poll_interval=0.01
+    )
+
+    assert ms_token is None
+    assert 2 <= context.polls <= 10
@@ -0,0 +1,185 @@
+from TikTokApi.session_pool import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    SessionPool,
+)
+from TikTokApi.exceptions import EmptyResponseException, NotFoundException
+from TikTokApi.tiktok import TikTokPlaywrightSession
+import asyncio
+import pytest
+
+
+def create_pool(num_sessions, max_concurrency=None, **kwargs):
+    pool = SessionPool(max_concurrency=max_concurrency, **kwargs)
+    for _ in range(num_sessions):
+        pool.sessions.append(TikTokPlaywrightSession(None, None))
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_select_least_loaded():
+    pool = create_pool(3)
+    pool.sessions[0].stats.in_flight = 2
+    pool.sessions[2].stats.in_flight = 1
+
+    i, session = pool.select()
+    assert i == 1
+    assert session is pool.sessions[1]
+
+    async with pool.acquire() as (i, session):
+        assert i == 1
+        assert session.stats.in_flight == 1
+        i, _ = pool.select()
+        assert i in (1, 2)
+
+    assert session.stats.in_flight == 0
+    assert session.stats.requests == 1
+    assert session.stats.latency is not None
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_sessions_are_avoided():
+    pool = create_pool(2)
+    pool.sessions[1].stats.in_flight = 5
+
+    for _ in range(pool.max_consecutive_errors):
+        with pytest.raises(EmptyResponseException):
+            async with pool.acquire(session_index=0):
+                raise EmptyResponseException(None, "TikTok returned an empty response")
+
+    assert not pool.is_healthy(pool.sessions[0])
+    assert pool.select()[0] == 1
+    assert [s["healthy"] for s in pool.stats()] == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_tiktok_errors_dont_count_against_the_session():
+    pool = create_pool(1)
+
+    for _ in range(pool.max_consecutive_errors):
+        with pytest.raises(NotFoundException):
+            async with pool.acquire():
+                raise NotFoundException(None, "user not exist", error_code=10202)
+
+    stats = pool.stats()[0]
+    assert stats["errors"] == 0
+    assert stats["consecutive_errors"] == 0
+    assert stats["healthy"]
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_queues_callers():
+    pool = create_pool(2, max_concurrency=1)
+    running = 0
+    peak = 0
+
+    async def request():
+        nonlocal running, peak
+        async with pool.acquire():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert peak == 2
+    assert pool.queued == 0
+    assert sum(s["requests"] for s in pool.stats()) == 6
+    assert all(s["in_flight"] == 0 for s in pool.stats())
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_slot():
+    pool = create_pool(1, max_concurrency=1)
+
+    async with pool.acquire():
+        waiter = asyncio.create_task(pool.acquire().__aenter__())
+        await asyncio.sleep(0)
+        assert pool.queued == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert pool.queued == 0
+    assert pool.sessions[0].stats.in_flight == 0
+
+
+async def served_order(pool, priorities):
+    """Queue a caller per priority behind a held slot, returning the order they're served in"""
+    order = []
+
+    async def request(name, priority):
+        async with pool.acquire(priority=priority):
+            order.append(name)
+
+    async with pool.acquire():
+        tasks = []
+        for name, priority in priorities:
+            tasks.append(asyncio.ensure_future(request(name, priority)))
+            await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_queued_callers_are_served_by_priority():
+    pool = create_pool(1, max_concurrency=1, aging=0)
+    order = await served_order(
+        pool,
+        [
+            ("bulk", PRIORITY_BULK),
+            ("interactive", PRIORITY_INTERACTIVE),
+            ("bulk 2", PRIORITY_BULK),
+        ],
+    )
+    assert order == ["interactive", "bulk", "bulk 2"]
+
+
+@pytest.mark.asyncio
+async def test_waiting_callers_age_past_newer_higher_priority_ones():
+    pool = create_pool(1, max_concurrency=1, aging=1000)
+    order = await served_order(
+        pool, [("bulk", PRIORITY_BULK), ("interactive", PRIORITY_INTERACTIVE)]
+    )
+    assert order == ["bulk", "interactive"]
+
+
+@pytest.mark.asyncio
+async def test_strict_exclude_waits_for_another_session():
+    pool = create_pool(2, max_concurrency=1)
+
+    async def acquire_strict():
+        async with pool.acquire(exclude=[0], strict=True) as (i, _):
+            return i
+
+    async with pool.acquire(session_index=1):
+        assert not pool.has_free_slot(exclude=[0])
+        async with pool.acquire(exclude=[0]) as (i, _):
+            assert i == 0
+
+        strict = asyncio.ensure_future(acquire_strict())
+        await asyncio.sleep(0.01)
+        assert not strict.done()
+    assert await asyncio.wait_for(strict, 1) == 1
+
+
+@pytest.mark.asyncio
+async def test_weighted_acquire_waits_for_room():
+    pool = create_pool(1, max_concurrency=3)
+    order = []
+
+    async def take(name, weight):
+        async with pool.acquire(weight=weight):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async with pool.acquire():
+        task = asyncio.ensure_future(take("batch", 3))
+        await asyncio.sleep(0)
+        assert pool.queued == 1
+        assert pool.stats()[0]["in_flight"] == 1
+    await task
+    assert order == ["batch"]
+    assert pool.stats()[0]["in_flight"] == 0
+    assert pool.stats()[0]["requests"] == 4
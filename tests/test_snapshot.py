@@ -0,0 +1,28 @@
+from TikTokApi.snapshot import read_snapshot, write_snapshot
+import json
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "sessions.json")
+    session = {
+        "storage_state": {"cookies": [], "origins": []},
+        "ms_token": "token",
+        "headers": {"user-agent": "test"},
+        "params": {"aid": "1988"},
+        "base_url": "https://www.tiktok.com",
+        "proxy": None,
+    }
+    write_snapshot(path, [session, {**session, "ms_token": None}])
+
+    assert read_snapshot(path) == [session]
+    assert read_snapshot(path, max_age=3600) == [session]
+
+
+def test_stale_or_missing_snapshot(tmp_path):
+    path = tmp_path / "sessions.json"
+    assert read_snapshot(str(path)) == []
+
+    path.write_text(
+        json.dumps({"version": 1, "created_at": 0, "sessions": [{"ms_token": "x"}]})
+    )
+    assert read_snapshot(str(path), max_age=60) == []
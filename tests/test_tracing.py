@@ -0,0 +1,59 @@
+from TikTokApi.tiktok import _SIGNED_FETCH_TIMED_JS
+from TikTokApi.tracing import Tracer
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_requests_nest_under_paginator_spans(tmp_path, make_page, make_api):
+    page = make_page(
+        {"statusCode": 0, "itemList": [], "hasMore": False}, timings=(0.0, 1.0, 5.0)
+    )
+    api = make_api(page, tracer=Tracer())
+    user = api.user(user_id="1", sec_uid="sec", username="therock")
+    async for _ in user.videos():
+        pass
+
+    assert page.scripts == [_SIGNED_FETCH_TIMED_JS]
+    spans = {span.name: span for span in api.tracer.spans}
+    assert spans["User.videos"].parent is None
+    assert spans["request"].parent is spans["User.videos"]
+    assert spans["request"].args == {"endpoint": "/api/post/item_list/"}
+    assert spans["acquire"].parent is spans["request"]
+    assert spans["attempt"].session == 0
+    for stage in ("wait_signer", "sign", "fetch", "decode"):
+        assert spans[stage].parent is spans["attempt"]
+    assert spans["sign"].end <= spans["fetch"].start <= spans["decode"].start
+
+    path = str(tmp_path / "trace.json")
+    api.tracer.export(path)
+    events = api.tracer.chrome_trace()["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert {e["tid"] for e in complete if e["pid"] == 1} == {spans["User.videos"].track}
+    assert [e["name"] for e in complete if e["pid"] == 2] == ["attempt"]
+    Tracer.active = None
+
+
+@pytest.mark.asyncio
+async def test_consumer_runs_outside_the_paginator_span(make_page, make_api):
+    item = {
+        "id": "123",
+        "createTime": 0,
+        "stats": {},
+        "author": {"id": "1", "secUid": "sec", "uniqueId": "therock"},
+    }
+    page = make_page(
+        {"statusCode": 0, "itemList": [item], "hasMore": False},
+        timings=(0.0, 1.0, 5.0),
+    )
+    api = make_api(page, tracer=Tracer())
+    user = api.user(user_id="1", sec_uid="sec", username="therock")
+    async for _ in user.videos():
+        await api.make_request("https://www.tiktok.com/api/user/detail/")
+
+    spans = {span.name: span for span in api.tracer.spans}
+    requests = [s for s in api.tracer.spans if s.name == "request"]
+    assert requests[0].parent is spans["User.videos"]
+    assert requests[1].parent is None
+    assert spans["yield"].parent is spans["User.videos"]
+    assert spans["yield"].start <= requests[1].start
+    Tracer.active = None
@@ -0,0 +1,41 @@
+from TikTokApi.tiktok import TikTokPlaywrightSession
+from TikTokApi.transport import HTTPTransport
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import pytest
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps(
+            {"path": self.path, "cookie": self.headers.get("cookie")}
+        ).encode()
+        self.send_response(200)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeContext:
+    async def cookies(self):
+        return [{"name": "msToken", "value": "token", "domain": "127.0.0.1", "path": "/"}]
+
+
+@pytest.mark.asyncio
+async def test_fetch_shares_session_cookies():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    transport = HTTPTransport()
+    session = TikTokPlaywrightSession(FakeContext(), None)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/api/item_list/?X-Bogus=1"
+        body = json.loads(await transport.fetch(session, url, {"host": "ignored"}))
+        assert body["path"] == "/api/item_list/?X-Bogus=1"
+        assert body["cookie"] == "msToken=token"
+    finally:
+        await transport.close()
+        server.shutdown()